@@ -0,0 +1,126 @@
+# analytics.py
+import time
+import queue
+import logging
+import threading
+import requests
+
+# The GA4 Measurement Protocol accepts at most this many events per request
+MAX_EVENTS_PER_REQUEST = 25
+
+class GA4Transport:
+    """
+    Sends event payloads to the GA4 Measurement Protocol over one pooled
+    requests.Session, so batches reuse the same HTTPS connection. Anything with
+    a send(payload) method returning True on success can stand in for it, e.g.
+    a local collector stub in tests.
+    """
+
+    def __init__(self, measurement_id, api_secret, url, timeout=5):
+        self.url = url
+        self.params = {'measurement_id': measurement_id, 'api_secret': api_secret}
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def send(self, payload):
+        response = self.session.post(self.url, params=self.params, json=payload, timeout=self.timeout)
+        # 204 is success for GA4
+        if response.status_code in (200, 204):
+            return True
+        logging.error(f"GA collect returned {response.status_code}: {response.text[:200]}")
+        return False
+
+class AnalyticsEmitter:
+    """
+    Background sender for server-side analytics events. track() only enqueues;
+    a daemon thread sends the events in batches of up to batch_size, as soon as
+    a batch is full or flush_interval seconds after its first event. When the
+    queue is full, events are dropped and counted rather than making the
+    request wait.
+    """
+
+    def __init__(self, transport, client_id='server-side', queue_size=1000,
+                 batch_size=MAX_EVENTS_PER_REQUEST, flush_interval=5.0):
+        self.transport = transport
+        self.client_id = client_id
+        self.batch_size = min(batch_size, MAX_EVENTS_PER_REQUEST)
+        self.flush_interval = flush_interval
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='analytics', daemon=True)
+                self._thread.start()
+
+    def track(self, name, params=None):
+        """Queue an event; returns False if it was dropped because the queue is full."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait({'name': name, 'params': params or {}})
+            return True
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            event = self._queue.get()
+            if event is None:
+                return
+
+            # Fill the batch until it is full or the interval since its first event is over
+            batch = [event]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    event = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if event is None:
+                    stopping = True
+                    break
+                batch.append(event)
+
+            self._send(batch)
+
+    def _send(self, batch):
+        try:
+            ok = self.transport.send({'client_id': self.client_id, 'events': batch})
+        except Exception as e:
+            logging.error(f"Could not send {len(batch)} analytics events: {str(e)}")
+            ok = False
+
+        with self._lock:
+            if ok:
+                self.sent += len(batch)
+            else:
+                self.failed += len(batch)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'queued': self._queue.qsize(),
+                'sent': self.sent,
+                'failed': self.failed,
+                'dropped': self.dropped
+            }
+
+    def close(self, timeout=5):
+        """Send what is queued right away (waiting up to timeout seconds) and stop the thread."""
+        if self._thread is not None:
+            deadline = time.monotonic() + timeout
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                # The sender is stuck; leave it, it is a daemon thread
+                logging.warning(f"Analytics queue still full after {timeout}s, dropping {self._queue.qsize()} events")
+                return
+            self._thread.join(max(deadline - time.monotonic(), 0))
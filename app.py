@@ -8,27 +8,33 @@ from pytz import timezone
 from werkzeug.security import generate_password_hash, check_password_hash
 from itsdangerous import URLSafeTimedSerializer, SignatureExpired
 from flask_mail import Mail, Message
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError
+from sqlalchemy import select, union_all, literal, null, or_, and_
 import os
 import json
 from config import Config
-from youtube_utils import extract_channel_id, fetch_channel_data, extract_video_id, get_video_data, get_watch_history
-from openai_utils import generate_channel_report, generate_video_summary, analyze_watch_history
+from youtube_utils import extract_channel_id, fetch_channel_data, extract_video_id, get_video_data, get_watch_history, transcript_cache, channel_id_cache
+from openai_utils import generate_channel_report, generate_video_summary, analyze_watch_history, completion_cache, completion_usage
 import logging
 from logging.handlers import RotatingFileHandler
-from export_utils import (
-    generate_channel_report_pdf,
-    generate_video_summary_pdf,
-    generate_channel_report_markdown,
-    generate_video_summary_markdown
-)
+from export_utils import EXPORT_FORMATS, EXPORT_RENDER_VERSION
+from export_worker import render_export_async
 from io import BytesIO
+from job_queue import JobQueue, PARTIAL_EVENT_TYPE
+from single_flight import SingleFlight
+import debug_artifacts
+from analytics import AnalyticsEmitter, GA4Transport
+from json_responses import RawJSON, splice_json_object, row_etag, compress, choose_encoding, json_response, not_modified
 from waitress import serve
 from google_auth_oauthlib.flow import Flow
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
 import uuid
 import time
+import atexit
+from concurrent.futures import ThreadPoolExecutor
+import base64
+import binascii
 
 
 ### -------------------------------------------------------------------------------------------------------
@@ -65,6 +71,28 @@ login_manager = LoginManager(app)
 login_manager.login_view = 'login'
 mail = Mail(app)
 
+# Background workers for channel reports and video summaries
+job_queue = JobQueue(max_workers=Config.REPORT_WORKERS)
+
+# Concurrent analyses of the same channel or video share one computation
+analysis_flights = SingleFlight()
+
+# Concurrent first downloads of the same export share one render
+export_flights = SingleFlight()
+
+# Stores prerendered exports, apart from the report workers so a write never waits behind a report
+export_store_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='export-store')
+
+# Server-side Google Analytics events, sent in batches by a background thread
+analytics = None
+if Config.GOOGLE_ANALYTICS_ID and Config.GA4_API_SECRET:
+    analytics = AnalyticsEmitter(
+        GA4Transport(Config.GOOGLE_ANALYTICS_ID, Config.GA4_API_SECRET, Config.GA4_COLLECT_URL),
+        queue_size=Config.ANALYTICS_QUEUE_SIZE,
+        flush_interval=Config.ANALYTICS_FLUSH_INTERVAL
+    )
+    atexit.register(analytics.close)
+
 ### -------------------------------------------------------------------------------------------------------
 ### DATABASE MODELS ---------------------------------------------------------------------------------------
 ### -------------------------------------------------------------------------------------------------------
@@ -112,6 +140,9 @@ class User(UserMixin, db.Model):
     def delete_account(self):
         UserReportAccess.query.filter_by(user_id=self.id).delete()
         UserVideoAccess.query.filter_by(user_id=self.id).delete()
+        job_ids = db.session.query(ReportJob.id).filter_by(user_id=self.id)
+        ReportJobEvent.query.filter(ReportJobEvent.job_id.in_(job_ids.scalar_subquery())).delete(synchronize_session=False)
+        ReportJob.query.filter_by(user_id=self.id).delete()
         db.session.delete(self)
         db.session.commit()
 
@@ -123,17 +154,60 @@ class User(UserMixin, db.Model):
     def video_summaries(self):
         return VideoSummary.query.join(UserVideoAccess).filter(UserVideoAccess.user_id == self.id)
 
+def to_int(value):
+    """int(value) for counts the YouTube API returns as strings, or None if missing."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+# Fields of raw channel/video data shown above a report or summary
+CHANNEL_HEADER_FIELDS = ('title', 'avatar_url', 'banner_url', 'subscriber_count', 'total_video_count', 'trailer_video_id')
+VIDEO_HEADER_FIELDS = ('title', 'youtube_video_id', 'thumbnail_url', 'views', 'like_count', 'comment_count', 'date_published', 'channel_title')
+
+def channel_header(channel_data):
+    """
+    raw_channel_data reduced to what the report view shows: the channel header
+    fields and, in 'videos', only the most viewed video's ID, title and views.
+    """
+    header = {key: channel_data.get(key) for key in CHANNEL_HEADER_FIELDS}
+    videos = channel_data.get('videos') or []
+    header['videos'] = [
+        {key: video.get(key) for key in ('youtube_video_id', 'title', 'views')}
+        for video in sorted(videos, key=lambda video: video.get('views') or 0, reverse=True)[:1]
+    ]
+    return header
+
+def video_header(video_data):
+    """raw_video_data without the transcript, description, tags and comments."""
+    return {key: video_data.get(key) for key in VIDEO_HEADER_FIELDS}
+
 class ChannelReport(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     channel_id = db.Column(db.String(100), unique=True, nullable=False)
     channel_title = db.Column(db.String(200), nullable=False)
-    report_data = db.Column(db.Text, nullable=False)
-    raw_channel_data = db.Column(db.Text, nullable=True)
+    # Large payloads are deferred: only loaded when accessed (together) or queried explicitly
+    report_data = db.deferred(db.Column(db.Text, nullable=False), group='payload')
+    raw_channel_data = db.deferred(db.Column(db.Text, nullable=True), group='payload')
     date_created = db.Column(db.DateTime(timezone=True), nullable=False, default=get_local_time)
     user_accesses = db.relationship('UserReportAccess', back_populates='report')
     content_categories = db.Column(db.JSON, nullable=True)
     video_formats = db.Column(db.JSON, nullable=True)
     content_category_justification = db.Column(db.Text, nullable=True)
+    # Listing fields copied out of raw_channel_data so the dashboard never has to parse it
+    avatar_url = db.Column(db.String(500), nullable=True)
+    banner_url = db.Column(db.String(500), nullable=True)
+    subscriber_count = db.Column(db.BigInteger, nullable=True)
+    video_count = db.Column(db.Integer, nullable=True)
+    # The part of raw_channel_data the report view shows, as JSON (see channel_header)
+    header_data = db.Column(db.Text, nullable=True)
+
+    def set_listing(self, channel_data):
+        self.avatar_url = channel_data.get('avatar_url')
+        self.banner_url = channel_data.get('banner_url')
+        self.subscriber_count = to_int(channel_data.get('subscriber_count'))
+        self.video_count = to_int(channel_data.get('total_video_count'))
+        self.header_data = json.dumps(channel_header(channel_data))
 
     def set_categorization(self, categorization):
         self.content_categories = categorization['content_categories']
@@ -154,16 +228,28 @@ class UserReportAccess(db.Model):
     date_accessed = db.Column(db.DateTime(timezone=True), nullable=False, default=get_local_time)
     user = db.relationship('User', back_populates='report_accesses')
     report = db.relationship('ChannelReport', back_populates='user_accesses')
-    __table_args__ = (db.UniqueConstraint('user_id', 'report_id', name='uq_user_report'),)
+    __table_args__ = (db.UniqueConstraint('user_id', 'report_id', name='uq_user_report'),
+                      db.Index('ix_user_report_access_user_date', 'user_id', 'date_accessed'))
 
 class VideoSummary(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     video_id = db.Column(db.String(100), unique=True, nullable=False)
     video_title = db.Column(db.String(200), nullable=False)
-    summary_data = db.Column(db.Text, nullable=False)
-    raw_video_data = db.Column(db.Text, nullable=True)
+    # Large payloads are deferred: only loaded when accessed (together) or queried explicitly
+    summary_data = db.deferred(db.Column(db.Text, nullable=False), group='payload')
+    raw_video_data = db.deferred(db.Column(db.Text, nullable=True), group='payload')
     date_created = db.Column(db.DateTime(timezone=True), nullable=False, default=get_local_time)
     user_accesses = db.relationship('UserVideoAccess', back_populates='summary')
+    # Listing fields copied out of raw_video_data so the dashboard never has to parse it
+    thumbnail_url = db.Column(db.String(500), nullable=True)
+    view_count = db.Column(db.BigInteger, nullable=True)
+    # The part of raw_video_data the summary view shows, as JSON (see video_header)
+    header_data = db.Column(db.Text, nullable=True)
+
+    def set_listing(self, video_data):
+        self.thumbnail_url = video_data.get('thumbnail_url')
+        self.view_count = to_int(video_data.get('views'))
+        self.header_data = json.dumps(video_header(video_data))
 
 class UserVideoAccess(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -172,7 +258,56 @@ class UserVideoAccess(db.Model):
     date_accessed = db.Column(db.DateTime(timezone=True), nullable=False, default=get_local_time)
     user = db.relationship('User', back_populates='video_accesses')
     summary = db.relationship('VideoSummary', back_populates='user_accesses')
-    __table_args__ = (db.UniqueConstraint('user_id', 'summary_id', name='uq_user_video'),)
+    __table_args__ = (db.UniqueConstraint('user_id', 'summary_id', name='uq_user_video'),
+                      db.Index('ix_user_video_access_user_date', 'user_id', 'date_accessed'))
+
+class ReportJob(db.Model):
+    id = db.Column(db.String(36), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    url = db.Column(db.String(500), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='queued')
+    redirect_url = db.Column(db.String(200), nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    date_created = db.Column(db.DateTime(timezone=True), nullable=False, default=get_local_time)
+    date_updated = db.Column(db.DateTime(timezone=True), nullable=False, default=get_local_time, onupdate=get_local_time)
+
+    def get_events(self, after=0):
+        """The job's stored events from index `after`, in order."""
+        rows = db.session.query(ReportJobEvent.data) \
+            .filter(ReportJobEvent.job_id == self.id, ReportJobEvent.seq >= after) \
+            .order_by(ReportJobEvent.seq).all()
+        return [json.loads(row.data) for row in rows]
+
+class ReportJobEvent(db.Model):
+    # A job's progress events, appended one row each; seq is the event's index
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.String(36), db.ForeignKey('report_job.id'), nullable=False)
+    seq = db.Column(db.Integer, nullable=False)
+    data = db.Column(db.Text, nullable=False)
+    date_created = db.Column(db.DateTime(timezone=True), nullable=False, default=get_local_time)
+    __table_args__ = (db.UniqueConstraint('job_id', 'seq', name='uq_report_job_event_seq'),)
+
+class CompressedResponse(db.Model):
+    # Precompressed /report and /summary response bodies, one per row and encoding
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(20), nullable=False)
+    item_id = db.Column(db.Integer, nullable=False)
+    encoding = db.Column(db.String(10), nullable=False)
+    etag = db.Column(db.String(100), nullable=False)
+    body = db.Column(db.LargeBinary, nullable=False)
+    date_created = db.Column(db.DateTime(timezone=True), nullable=False, default=get_local_time)
+    __table_args__ = (db.UniqueConstraint('kind', 'item_id', 'encoding', name='uq_compressed_response'),)
+
+class RenderedExport(db.Model):
+    # Rendered PDF/Markdown exports of reports and summaries, one per row and format
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(20), nullable=False)
+    item_id = db.Column(db.Integer, nullable=False)
+    format = db.Column(db.String(10), nullable=False)
+    etag = db.Column(db.String(100), nullable=False)
+    body = db.Column(db.LargeBinary, nullable=False)
+    date_created = db.Column(db.DateTime(timezone=True), nullable=False, default=get_local_time)
+    __table_args__ = (db.UniqueConstraint('kind', 'item_id', 'format', name='uq_rendered_export'),)
 
 class WatchHistoryAnalysis(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -196,6 +331,16 @@ def load_user(user_id):
 def from_json(value):
     return json.loads(value)
 
+@app.template_filter('compact_number')
+def compact_number(value):
+    # 1234567 -> '1.2M', for the counts on dashboard cards
+    if value is None:
+        return ''
+    for threshold, suffix in ((1_000_000_000, 'B'), (1_000_000, 'M'), (1_000, 'K')):
+        if abs(value) >= threshold:
+            return f"{value / threshold:.1f}".rstrip('0').rstrip('.') + suffix
+    return str(value)
+
 @app.template_filter('days_ago')
 def days_ago(date):
     if date.tzinfo is None:
@@ -286,46 +431,17 @@ If you did not make this request then simply ignore this email and no changes wi
 
 def track_event(event_name, event_params=None):
     """
-    Track server-side events to Google Analytics 4 with detailed logging
+    Queue a server-side event for Google Analytics 4. It is sent in the
+    background with other events, so this never waits on the network.
     """
-    app.logger.info(f"Attempting to track GA event: {event_name}")
-    
-    measurement_id = app.config.get('GOOGLE_ANALYTICS_ID')
-    api_secret = os.environ.get('GA4_API_SECRET')
-    
-    if not measurement_id:
-        app.logger.warning("GA tracking disabled - GOOGLE_ANALYTICS_ID not set")
+    if analytics is None:
+        app.logger.warning("GA tracking disabled - GOOGLE_ANALYTICS_ID or GA4_API_SECRET not set")
         return
-    if not api_secret:
-        app.logger.warning("GA tracking disabled - GA4_API_SECRET not set")
-        return
-        
-    try:
-        import requests
-        url = f'https://www.google-analytics.com/mp/collect?measurement_id={measurement_id}&api_secret={api_secret}'
-        
-        payload = {
-            'client_id': 'server-side',
-            'events': [{
-                'name': event_name,
-                'params': event_params or {}
-            }]
-        }
-        
-        app.logger.debug(f"Sending GA event to {url}")
-        app.logger.debug(f"Payload: {payload}")
-        
-        response = requests.post(url, json=payload, timeout=2)
-        
-        # 204 is success for GA4
-        if response.status_code in [200, 204]:
-            app.logger.info(f"Successfully tracked GA event: {event_name}")
-        else:
-            app.logger.error(f"Failed to track GA event. Status code: {response.status_code}")
-            app.logger.error(f"Response content: {response.text}")
-            
-    except Exception as e:
-        app.logger.error(f"Exception tracking GA event: {str(e)}", exc_info=True)
+
+    if analytics.track(event_name, event_params):
+        app.logger.debug(f"Queued GA event: {event_name}")
+    else:
+        app.logger.warning(f"GA event queue full, dropped event: {event_name}")
 
 ### -------------------------------------------------------------------------------------------------------
 ### ROUTES ------------------------------------------------------------------------------------------------
@@ -343,7 +459,7 @@ def test_ga():
             'test_time': datetime.now().isoformat(),
             'user': current_user.email
         })
-        return "GA test event sent - check logs"
+        return "GA test event queued - check /debug/ga-config"
     return "Unauthorized", 403
 
 @app.route('/debug/ga-config')
@@ -354,7 +470,20 @@ def check_ga_config():
             'GA_ID_SET': bool(app.config.get('GOOGLE_ANALYTICS_ID')),
             'GA_ID_VALUE': app.config.get('GOOGLE_ANALYTICS_ID')[:5] + '...' if app.config.get('GOOGLE_ANALYTICS_ID') else None,
             'GA_SECRET_SET': bool(os.environ.get('GA4_API_SECRET')),
-            'GA_SECRET_LENGTH': len(os.environ.get('GA4_API_SECRET', ''))
+            'GA_SECRET_LENGTH': len(os.environ.get('GA4_API_SECRET', '')),
+            'GA_EVENTS': analytics.stats() if analytics else None
+        }
+    return "Unauthorized", 403
+
+@app.route('/debug/cache-stats')
+@login_required
+def check_cache_stats():
+    if current_user.is_authenticated:
+        return {
+            'completions': completion_cache.stats(),
+            'transcripts': transcript_cache.stats(),
+            'channel_ids': channel_id_cache.stats(),
+            'openai_usage': completion_usage.summary()
         }
     return "Unauthorized", 403
 
@@ -633,43 +762,23 @@ def register():
 @app.route('/export/report/<int:report_id>/<format>')
 @login_required
 def export_report(report_id, format):
-    report = ChannelReport.query.get(report_id)
+    report = db.session.query(ChannelReport.id, ChannelReport.channel_id, ChannelReport.date_created).filter_by(id=report_id).first()
     user_access = UserReportAccess.query.filter_by(user_id=current_user.id, report_id=report_id).first()
     
     if not report or not user_access:
         flash('Report not found or access denied')
         return redirect(url_for('dashboard'))
-    
+
+    if format not in EXPORT_FORMATS:
+        flash('Invalid export format')
+        return redirect(url_for('dashboard'))
+
     try:
-        if format == 'pdf':
-            pdf = generate_channel_report_pdf(report.report_data, report.raw_channel_data)
-            
-            # Get PDF content as bytes
-            pdf_content = pdf.output(dest='S').encode('latin-1')
-            
-            # Create BytesIO object from the bytes
-            pdf_output = BytesIO(pdf_content)
-            
-            return send_file(
-                pdf_output,
-                mimetype='application/pdf',
-                as_attachment=True,
-                download_name=f'channel_report_{report.channel_id}.pdf'
-            )
-            
-        elif format == 'markdown':
-            markdown = generate_channel_report_markdown(report.report_data, report.raw_channel_data)
-            
-            return Response(
-                markdown,
-                mimetype='text/markdown',
-                headers={
-                    'Content-Disposition': f'attachment; filename=channel_report_{report.channel_id}.md'
-                }
-            )
-        else:
-            flash('Invalid export format')
-            return redirect(url_for('dashboard'))
+        def load_payload():
+            return db.session.query(ChannelReport.report_data, ChannelReport.raw_channel_data).filter_by(id=report_id).one()
+
+        return export_response('report', report_id, report.date_created, format,
+                               f'channel_report_{report.channel_id}', load_payload)
             
     except Exception as e:
         app.logger.error(f"Export error: {str(e)}")
@@ -679,49 +788,101 @@ def export_report(report_id, format):
 @app.route('/export/summary/<int:summary_id>/<format>')
 @login_required
 def export_summary(summary_id, format):
-    summary = VideoSummary.query.get(summary_id)
+    summary = db.session.query(VideoSummary.id, VideoSummary.video_id, VideoSummary.date_created).filter_by(id=summary_id).first()
     user_access = UserVideoAccess.query.filter_by(user_id=current_user.id, summary_id=summary_id).first()
     
     if not summary or not user_access:
         flash('Summary not found or access denied')
         return redirect(url_for('dashboard'))
-    
+
+    if format not in EXPORT_FORMATS:
+        flash('Invalid export format')
+        return redirect(url_for('dashboard'))
+
     try:
-        if format == 'pdf':
-            pdf = generate_video_summary_pdf(summary.summary_data, summary.raw_video_data)
-            
-            # Get PDF content as bytes
-            pdf_content = pdf.output(dest='S').encode('latin-1')
-            
-            # Create BytesIO object from the bytes
-            pdf_output = BytesIO(pdf_content)
-            
-            return send_file(
-                pdf_output,
-                mimetype='application/pdf',
-                as_attachment=True,
-                download_name=f'video_summary_{summary.video_id}.pdf'
-            )
-            
-        elif format == 'markdown':
-            markdown = generate_video_summary_markdown(summary.summary_data, summary.raw_video_data)
-            
-            return Response(
-                markdown,
-                mimetype='text/markdown',
-                headers={
-                    'Content-Disposition': f'attachment; filename=video_summary_{summary.video_id}.md'
-                }
-            )
-        else:
-            flash('Invalid export format')
-            return redirect(url_for('dashboard'))
+        def load_payload():
+            return db.session.query(VideoSummary.summary_data, VideoSummary.raw_video_data).filter_by(id=summary_id).one()
+
+        return export_response('summary', summary_id, summary.date_created, format,
+                               f'video_summary_{summary.video_id}', load_payload)
             
     except Exception as e:
         app.logger.error(f"Export error: {str(e)}")
         flash('Error generating export')
         return redirect(url_for('dashboard'))
 
+def export_etag(kind, item_id, date_created, format):
+    return row_etag(f'export.{kind}', item_id, date_created, f'-{format}-r{EXPORT_RENDER_VERSION}')
+
+def export_response(kind, item_id, date_created, format, filename, load_payload):
+    """
+    Send a report/summary export as a download. Exports are rendered once, in
+    the export process pool, and kept in rendered_export keyed by the row's
+    identity, creation time and format; a matching If-None-Match gets a 304.
+    load_payload() returns the (data, raw_data) columns and runs on a miss.
+    """
+    etag = export_etag(kind, item_id, date_created, format)
+    if request.if_none_match.contains(etag):
+        return not_modified(etag)
+
+    body = db.session.query(RenderedExport.body) \
+        .filter_by(kind=kind, item_id=item_id, format=format, etag=etag).scalar()
+    if body is None:
+        def render(emit):
+            data, raw_data = load_payload()
+            rendered = render_export_async(kind, format, data, raw_data).result(timeout=Config.EXPORT_RENDER_TIMEOUT)
+            store_rendered_export(kind, item_id, format, etag, rendered)
+            return rendered
+
+        body, _ = export_flights.do((kind, item_id, format), render)
+
+    mimetype, extension = EXPORT_FORMATS[format]
+    response = send_file(
+        BytesIO(body),
+        mimetype=mimetype,
+        as_attachment=True,
+        download_name=f'{filename}.{extension}',
+        etag=etag
+    )
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def store_rendered_export(kind, item_id, format, etag, body):
+    """Save a rendered export, replacing one rendered from an older version of the row or renderer."""
+    try:
+        RenderedExport.query.filter_by(kind=kind, item_id=item_id, format=format).delete()
+        db.session.add(RenderedExport(kind=kind, item_id=item_id, format=format, etag=etag, body=body))
+        db.session.commit()
+    except IntegrityError:
+        # Another request stored it first
+        db.session.rollback()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        app.logger.warning(f"Could not store {format} export of {kind} {item_id}: {str(e)}")
+
+def prerender_exports(kind, item_id, date_created, data, raw_data):
+    """
+    Queue every export format of a newly created report/summary on the export
+    pool; each is stored as it finishes, so the first download is a cache hit.
+    Done callbacks run on the pool's management thread, so they only hand the
+    database write over to export_store_executor.
+    """
+    if not Config.EXPORT_PRERENDER:
+        return
+
+    def store(future, format):
+        try:
+            body = future.result()
+        except Exception as e:
+            app.logger.warning(f"Could not prerender {format} export of {kind} {item_id}: {str(e)}")
+            return
+        with app.app_context():
+            store_rendered_export(kind, item_id, format, export_etag(kind, item_id, date_created, format), body)
+
+    for format in EXPORT_FORMATS:
+        future = render_export_async(kind, format, data, raw_data)
+        future.add_done_callback(lambda future, format=format: export_store_executor.submit(store, future, format))
+
 
 @app.route("/reset_password", methods=['GET', 'POST'])
 def reset_request():
@@ -798,330 +959,642 @@ def logout():
     logout_user()
     return redirect(url_for('index'))
 
-@app.route('/process_url', methods=['POST'])
-@login_required
-def process_url():
-    def generate():
-        start_time = time.time()
-        success = False
-        existing_report = False
-        existing_summary = False
-        try:
-            app.logger.info("Starting /process_url endpoint")
+def run_analysis_job(job, user_id, url, dashboard_url):
+    """
+    Worker-side body of /process_url: analyse a channel or video URL for a user,
+    reporting progress as NDJSON-style events on the job.
+    Runs on the job queue, so it gets its own app context. There is no request,
+    so URLs it hands back are built from dashboard_url, resolved at submission.
+    """
+    with app.app_context():
+        update_report_job(job.id, status='running')
+
+        def emit(event):
+            # Persist first so the job row is final by the time subscribers see the event
+            record_job_event(job.id, event)
+            job.emit(event)
+
+        with debug_artifacts.artifact_scope(job.id):
+            analyse_url(job, emit, user_id, url, dashboard_url)
+
+def analyse_url(job, emit, user_id, url, dashboard_url):
+    """
+    Create (or reuse) the channel report or video summary for url and grant user_id access.
+    If another job is already generating it, this job follows that one (see
+    follow_analysis) and returns, freeing its worker.
+    """
+    start_time = time.time()
+
+    def track_failure(content_type, reason):
+        track_event('content_analysis_failed', {
+            'type': content_type,
+            'reason': reason,
+            'processing_time': time.time() - start_time
+        })
+
+    def complete(content_type, item_id, new_content):
+        """Grant access to the finished report or summary and complete the job."""
+        if not item_id:
+            # Generation failed and has already reported why on the job
+            track_failure(content_type, 'processing_failed')
+            return
+
+        if content_type == 'channel':
+            grant_report_access(user_id, item_id)
+            redirect_url = f"{dashboard_url}?new_report={item_id}"
+        else:
+            grant_summary_access(user_id, item_id)
+            redirect_url = f"{dashboard_url}?new_summary={item_id}"
+        app.logger.info(f"Redirecting to: {redirect_url}")
+
+        emit({
+            'type': 'complete',
+            'redirect_url': redirect_url
+        })
+
+        # Track completion
+        track_event('content_analysis_completed', {
+            'type': content_type,
+            'processing_time': time.time() - start_time,
+            'new_content': new_content
+        })
+
+    def fail(e):
+        app.logger.error(f"Error in analysis job {job.id}: {str(e)}", exc_info=True)
+        track_event('content_analysis_failed', {
+            'reason': 'exception',
+            'error_message': str(e),
+            'processing_time': time.time() - start_time
+        })
+        emit({'type': 'error', 'message': f'An unexpected error occurred: {str(e)}'})
+
+    try:
+        app.logger.info(f"Starting analysis job {job.id}")
+        app.logger.info(f"Processing URL: {url}")
+        emit({'type': 'progress', 'message': 'Analyzing URL type '})
+
+        # Try to extract channel ID first
+        app.logger.info("Attempting to extract channel ID")
+        channel_id = extract_channel_id(url)
+        app.logger.info(f"Channel ID extraction result: {channel_id}")
+        
+        if channel_id:
+            app.logger.info(f"Processing URL as channel, Channel ID: {channel_id}")
+            emit({'type': 'progress', 'message': 'Channel URL detected. Processing channel analysis '})
+
+            # Track analysis attempt
+            track_event('content_analysis_started', {
+                'type': 'channel'
+            })
             
-            # Log the incoming request
-            data = request.get_json()
-            app.logger.info(f"Received request data: {data}")
+            # Check for existing report
+            existing_report = ChannelReport.query.filter_by(channel_id=channel_id).first()
+            app.logger.info(f"Existing report found: {existing_report is not None}")
             
-            if not data or 'url' not in data:
-                app.logger.error("Invalid request: Missing URL")
-                yield json.dumps({'type': 'error', 'message': 'Invalid request. Please provide a URL.'}) + '\n'
+            if existing_report:
+                app.logger.info(f"Found existing report for channel {channel_id}")
+                emit({'type': 'progress', 'message': 'Existing report found. Retrieving data '})
+                complete('channel', existing_report.id, False)
                 return
 
-            url = data['url']
-            app.logger.info(f"Processing URL: {url}")
-            yield json.dumps({'type': 'progress', 'message': 'Analyzing URL type '}) + '\n'
+            # Attach to a report already being generated for this channel, or generate it
+            key = ('channel', channel_id)
+            if follow_analysis(job, key, emit, lambda report_id: complete('channel', report_id, True), fail):
+                app.logger.info(f"Attached to in-flight report for channel {channel_id}")
+                return
+
+            report_id, _ = analysis_flights.do(
+                key,
+                lambda flight_emit: create_channel_report(channel_id, flight_emit),
+                on_event=emit
+            )
+            complete('channel', report_id, True)
 
-            # Try to extract channel ID first
-            app.logger.info("Attempting to extract channel ID")
-            channel_id = extract_channel_id(url)
-            app.logger.info(f"Channel ID extraction result: {channel_id}")
+        else:
+            # Try to process as video
+            app.logger.info("Attempting to process as video URL")
+            video_id = extract_video_id(url)
+            app.logger.info(f"Video ID extraction result: {video_id}")
+
+            # Track analysis attempt
+            track_event('content_analysis_started', {
+                'type': 'video_summary'
+            })
             
-            if channel_id:
-                app.logger.info(f"Processing URL as channel, Channel ID: {channel_id}")
-                yield json.dumps({'type': 'progress', 'message': 'Channel URL detected. Processing channel analysis '}) + '\n'
+            if not video_id:
+                app.logger.error("Invalid YouTube URL - not a channel or video URL")
+                emit({'type': 'error', 'message': 'Invalid YouTube URL'})
+                track_failure('video', 'invalid_url')
+                return
 
-                # Track analysis attempt
-                track_event('content_analysis_started', {
-                    'type': 'channel'
-                })
-                
-                # Check for existing report
-                existing_report = ChannelReport.query.filter_by(channel_id=channel_id).first()
-                app.logger.info(f"Existing report found: {existing_report is not None}")
-                
-                if existing_report:
-                    app.logger.info(f"Found existing report for channel {channel_id}")
-                    yield json.dumps({'type': 'progress', 'message': 'Existing report found. Retrieving data '}) + '\n'
-                    
-                    # Create or update user access
-                    user_access = UserReportAccess.query.filter_by(
-                        user_id=current_user.id, 
-                        report_id=existing_report.id
-                    ).first()
-                    
-                    if not user_access:
-                        app.logger.info("Creating new user access for existing report")
-                        user_access = UserReportAccess(
-                            user_id=current_user.id, 
-                            report_id=existing_report.id
-                        )
-                        db.session.add(user_access)
-                    else:
-                        app.logger.info("Updating existing user access timestamp")
-                        user_access.date_accessed = get_local_time()
-                    
-                    db.session.commit()
-                    
-                    redirect_url = url_for('dashboard', new_report=existing_report.id)
-                    app.logger.info(f"Redirecting to: {redirect_url}")
-                    
-                    success = True
-                    
-                    yield json.dumps({
-                        'type': 'complete',
-                        'redirect_url': redirect_url
-                    }) + '\n'
-                    return
+            emit({'type': 'progress', 'message': 'Video URL detected, creating video summary '})
 
-                # Generate new report
-                app.logger.info("Fetching channel data for new report")
-                yield json.dumps({'type': 'progress', 'message': 'Fetching channel data from YouTube '}) + '\n'
-                channel_data = fetch_channel_data(channel_id)
+            # Check for existing summary
+            existing_summary = VideoSummary.query.filter_by(video_id=video_id).first()
+            app.logger.info(f"Existing summary found: {existing_summary is not None}")
+            
+            if existing_summary:
+                app.logger.info(f"Found existing summary for video {video_id}")
+                emit({'type': 'progress', 'message': 'Existing summary found. Retrieving data '})
+                complete('video', existing_summary.id, False)
+                return
 
-                if not channel_data:
-                    app.logger.error("Failed to fetch channel data")
-                    yield json.dumps({'type': 'error', 'message': 'Unable to fetch channel data'}) + '\n'
-                    return
+            # Attach to a summary already being generated for this video, or generate it
+            key = ('video', video_id)
+            if follow_analysis(job, key, emit, lambda summary_id: complete('video', summary_id, True), fail):
+                app.logger.info(f"Attached to in-flight summary for video {video_id}")
+                return
 
-                channel_title = channel_data.get('title', 'Unknown Channel')
-                app.logger.info(f"Channel title: {channel_title}")
-                yield json.dumps({'type': 'progress', 'message': f'Analyzing channel: {channel_title}'}) + '\n'
+            summary_id, _ = analysis_flights.do(
+                key,
+                lambda flight_emit: create_video_summary(video_id, flight_emit),
+                on_event=emit
+            )
+            complete('video', summary_id, True)
 
-                app.logger.info("Generating channel report")
-                yield json.dumps({'type': 'progress', 'message': 'Generating report '}) + '\n'
-                report_json = generate_channel_report(channel_data)
+    except Exception as e:
+        fail(e)
 
-                if not report_json:
-                    app.logger.error("Failed to generate channel report")
-                    yield json.dumps({'type': 'error', 'message': 'Failed to generate channel report'}) + '\n'
-                    return
+def follow_analysis(job, key, emit, on_result, on_error):
+    """
+    If another job is generating the report or summary for key, relay its
+    progress to this job and detach: once it is done, on_result(id) (or
+    on_error(exception)) runs on that job's worker and finishes this job.
+    Returns False, doing nothing, if nothing is in flight for key.
+    """
+    def on_done(result, error):
+        try:
+            if error is None:
+                on_result(result)
+            else:
+                on_error(error)
+        finally:
+            job.finish()
 
-                app.logger.info("Parsing report data and creating database entries")
-                report_data = json.loads(report_json)
-                categorization = report_data['consultation_report']['categorisation'][0]
+    if not analysis_flights.follow(key, emit, on_done):
+        return False
+    job.detach()
+    return True
 
-                # Create new report
-                new_report = ChannelReport(
-                    channel_id=channel_id,
-                    channel_title=channel_title,
-                    report_data=report_json,
-                    raw_channel_data=json.dumps(channel_data)
-                )
-                new_report.set_categorization(categorization)
-                db.session.add(new_report)
-                db.session.flush()
+def create_channel_report(channel_id, emit):
+    """
+    Fetch channel data, generate and store a new ChannelReport.
+    Returns the report ID, or None after emitting an error event.
+    """
+    app.logger.info("Fetching channel data for new report")
+    emit({'type': 'progress', 'message': 'Fetching channel data from YouTube '})
+    channel_data = fetch_channel_data(channel_id)
+
+    if not channel_data:
+        app.logger.error("Failed to fetch channel data")
+        emit({'type': 'error', 'message': 'Unable to fetch channel data'})
+        return None
+
+    channel_title = channel_data.get('title', 'Unknown Channel')
+    app.logger.info(f"Channel title: {channel_title}")
+    emit({'type': 'progress', 'message': f'Analyzing channel: {channel_title}'})
+
+    app.logger.info("Generating channel report")
+    emit({'type': 'progress', 'message': 'Generating report '})
+    report_json = generate_channel_report(channel_data, on_delta=partial_output_emitter(emit))
+
+    if not report_json:
+        app.logger.error("Failed to generate channel report")
+        emit({'type': 'error', 'message': 'Failed to generate channel report'})
+        return None
+
+    app.logger.info("Parsing report data and creating database entries")
+    report_data = json.loads(report_json)
+    categorization = report_data['consultation_report']['categorisation'][0]
+
+    # Create new report
+    raw_channel_json = json.dumps(channel_data)
+    new_report = ChannelReport(
+        channel_id=channel_id,
+        channel_title=channel_title,
+        report_data=report_json,
+        raw_channel_data=raw_channel_json
+    )
+    new_report.set_categorization(categorization)
+    new_report.set_listing(channel_data)
+    db.session.add(new_report)
 
-                # Create user access
-                user_access = UserReportAccess(user_id=current_user.id, report_id=new_report.id)
-                db.session.add(user_access)
-                db.session.commit()
-                app.logger.info(f"New report created with ID: {new_report.id}")
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Another process stored a report for this channel first; use theirs
+        db.session.rollback()
+        app.logger.info(f"Report for channel {channel_id} was created concurrently")
+        return ChannelReport.query.filter_by(channel_id=channel_id).first().id
 
-                redirect_url = url_for('dashboard', new_report=new_report.id)
-                app.logger.info(f"Redirecting to: {redirect_url}")
+    app.logger.info(f"New report created with ID: {new_report.id}")
+    prerender_exports('report', new_report.id, new_report.date_created, report_json, raw_channel_json)
+    return new_report.id
 
-                success = True
+def create_video_summary(video_id, emit):
+    """
+    Fetch video data, generate and store a new VideoSummary.
+    Returns the summary ID, or None after emitting an error event.
+    """
+    app.logger.info("Fetching video data for new summary")
+    emit({'type': 'progress', 'message': 'Fetching video data '})
 
-                yield json.dumps({
-                    'type': 'complete',
-                    'redirect_url': redirect_url
-                }) + '\n'
+    video_data = get_video_data(video_id)
 
-            else:
-                # Try to process as video
-                app.logger.info("Attempting to process as video URL")
-                video_id = extract_video_id(url)
-                app.logger.info(f"Video ID extraction result: {video_id}")
-
-                # Track analysis attempt
-                track_event('content_analysis_started', {
-                    'type': 'video_summary'
-                })
-                
-                if not video_id:
-                    app.logger.error("Invalid YouTube URL - not a channel or video URL")
-                    yield json.dumps({'type': 'error', 'message': 'Invalid YouTube URL'}) + '\n'
-                    return
+    if not video_data:
+        app.logger.error("Failed to fetch video data or subtitles not available")
+        emit({'type': 'error', 'message': 'Unable to fetch video data or subtitles not available'})
+        return None
 
-                yield json.dumps({'type': 'progress', 'message': 'Video URL detected, creating video summary '}) + '\n'
+    video_title = video_data[0].get('title', 'Unknown Video')
+    app.logger.info(f"Video title: {video_title}")
+    emit({'type': 'progress', 'message': f'Analyzing video: {video_title}'})
 
-                # Check for existing summary
-                existing_summary = VideoSummary.query.filter_by(video_id=video_id).first()
-                app.logger.info(f"Existing summary found: {existing_summary is not None}")
-                
-                if existing_summary:
-                    app.logger.info(f"Found existing summary for video {video_id}")
-                    yield json.dumps({'type': 'progress', 'message': 'Existing summary found. Retrieving data '}) + '\n'
-                    
-                    # Create or update user access
-                    user_access = UserVideoAccess.query.filter_by(
-                        user_id=current_user.id, 
-                        summary_id=existing_summary.id
-                    ).first()
-                    
-                    if not user_access:
-                        app.logger.info("Creating new user access for existing summary")
-                        user_access = UserVideoAccess(
-                            user_id=current_user.id, 
-                            summary_id=existing_summary.id
-                        )
-                        db.session.add(user_access)
-                    else:
-                        app.logger.info("Updating existing user access timestamp")
-                        user_access.date_accessed = get_local_time()
-                    
-                    db.session.commit()
-                    
-                    redirect_url = url_for('dashboard', new_summary=existing_summary.id)
-                    app.logger.info(f"Redirecting to: {redirect_url}")
-                    
-                    success = True
-                    
-                    yield json.dumps({
-                        'type': 'complete',
-                        'redirect_url': redirect_url
-                    }) + '\n'
-                    return
+    app.logger.info("Generating video summary")
+    emit({'type': 'progress', 'message': 'Generating summary '})
+    summary_json = generate_video_summary(video_data[0], on_delta=partial_output_emitter(emit))
+    
+    try:
+        summary = json.loads(summary_json)
+        app.logger.info("Successfully generated and parsed summary")
+    except json.JSONDecodeError as e:
+        app.logger.error(f"Failed to parse summary JSON: {str(e)}")
+        emit({'type': 'error', 'message': 'Failed to generate a valid summary'})
+        return None
+
+    # Create new summary
+    raw_video_json = json.dumps(video_data[0])
+    new_summary = VideoSummary(
+        video_id=video_id,
+        video_title=video_title,
+        summary_data=summary_json,
+        raw_video_data=raw_video_json
+    )
+    new_summary.set_listing(video_data[0])
+    db.session.add(new_summary)
 
-                # Generate new summary
-                app.logger.info("Fetching video data for new summary")
-                yield json.dumps({'type': 'progress', 'message': 'Fetching video data '}) + '\n'
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Another process stored a summary for this video first; use theirs
+        db.session.rollback()
+        app.logger.info(f"Summary for video {video_id} was created concurrently")
+        return VideoSummary.query.filter_by(video_id=video_id).first().id
 
-                video_data = get_video_data(video_id)
+    app.logger.info(f"New summary created with ID: {new_summary.id}")
+    prerender_exports('summary', new_summary.id, new_summary.date_created, summary_json, raw_video_json)
+    return new_summary.id
 
-                if not video_data:
-                    app.logger.error("Failed to fetch video data or subtitles not available")
-                    yield json.dumps({'type': 'error', 'message': 'Unable to fetch video data or subtitles not available'}) + '\n'
-                    return
+def partial_output_emitter(emit, interval=0.5):
+    """
+    Return an on_delta callback that forwards streamed model output as 'partial'
+    events, coalesced to at most one event per `interval` seconds.
+    """
+    pending = []
+    state = {'chars': 0, 'last_sent': 0.0}
+
+    def on_delta(text):
+        pending.append(text)
+        state['chars'] += len(text)
+        now = time.monotonic()
+        if now - state['last_sent'] >= interval:
+            emit({'type': 'partial', 'content': ''.join(pending), 'chars': state['chars']})
+            pending.clear()
+            state['last_sent'] = now
+
+    return on_delta
+
+def grant_report_access(user_id, report_id):
+    """Create the user's access to a report, or refresh its access time."""
+    user_access = UserReportAccess.query.filter_by(user_id=user_id, report_id=report_id).first()
+    
+    if not user_access:
+        app.logger.info("Creating new user access for report")
+        db.session.add(UserReportAccess(user_id=user_id, report_id=report_id))
+    else:
+        app.logger.info("Updating existing user access timestamp")
+        user_access.date_accessed = get_local_time()
+    
+    db.session.commit()
 
-                video_title = video_data[0].get('title', 'Unknown Video')
-                app.logger.info(f"Video title: {video_title}")
-                yield json.dumps({'type': 'progress', 'message': f'Analyzing video: {video_title}'}) + '\n'
+def grant_summary_access(user_id, summary_id):
+    """Create the user's access to a summary, or refresh its access time."""
+    user_access = UserVideoAccess.query.filter_by(user_id=user_id, summary_id=summary_id).first()
+    
+    if not user_access:
+        app.logger.info("Creating new user access for summary")
+        db.session.add(UserVideoAccess(user_id=user_id, summary_id=summary_id))
+    else:
+        app.logger.info("Updating existing user access timestamp")
+        user_access.date_accessed = get_local_time()
+    
+    db.session.commit()
 
-                app.logger.info("Generating video summary")
-                yield json.dumps({'type': 'progress', 'message': 'Generating summary '}) + '\n'
-                summary_json = generate_video_summary(video_data[0])
-                
-                try:
-                    summary = json.loads(summary_json)
-                    app.logger.info("Successfully generated and parsed summary")
-                except json.JSONDecodeError as e:
-                    app.logger.error(f"Failed to parse summary JSON: {str(e)}")
-                    yield json.dumps({'type': 'error', 'message': 'Failed to generate a valid summary'}) + '\n'
-                    return
+def update_report_job(job_id, **fields):
+    """
+    Update a job row on its own connection, so progress writes never commit (or
+    get rolled back with) the worker's pending session changes.
+    """
+    table = ReportJob.__table__
+    try:
+        with db.engine.begin() as conn:
+            conn.execute(table.update().where(table.c.id == job_id).values(**fields))
+    except SQLAlchemyError as e:
+        app.logger.error(f"Failed to update job {job_id}: {str(e)}")
 
-                # Create new summary
-                new_summary = VideoSummary(
-                    video_id=video_id,
-                    video_title=video_title,
-                    summary_data=summary_json,
-                    raw_video_data=json.dumps(video_data[0])
-                )
-                db.session.add(new_summary)
-                db.session.flush()
+def record_job_event(job_id, event, attempts=3):
+    """
+    Persist a job's progress event and its terminal status. Events are appended
+    as rows numbered in order; a writer that loses a race for the next number
+    retries with the one after.
+    """
+    # Streamed model output is only relayed live, not stored (nor indexed, see job_queue.Job)
+    if event.get('type') == PARTIAL_EVENT_TYPE:
+        return
 
-                # Create user access
-                user_access = UserVideoAccess(user_id=current_user.id, summary_id=new_summary.id)
-                db.session.add(user_access)
-                db.session.commit()
-                app.logger.info(f"New summary created with ID: {new_summary.id}")
+    events = ReportJobEvent.__table__
+    fields = {}
+    if event.get('type') == 'complete':
+        fields.update(status='complete', redirect_url=event.get('redirect_url'))
+    elif event.get('type') == 'error':
+        fields.update(status='error', error=event.get('message'))
 
-                redirect_url = url_for('dashboard', new_summary=new_summary.id)
-                app.logger.info(f"Redirecting to: {redirect_url}")
+    for attempt in range(attempts):
+        try:
+            with db.engine.begin() as conn:
+                next_seq = select(db.func.coalesce(db.func.max(events.c.seq) + 1, 0)) \
+                    .where(events.c.job_id == job_id).scalar_subquery()
+                conn.execute(events.insert().values(
+                    job_id=job_id, seq=next_seq, data=json.dumps(event), date_created=get_local_time()
+                ))
+                if fields:
+                    table = ReportJob.__table__
+                    conn.execute(table.update().where(table.c.id == job_id).values(**fields))
+            return
+        except IntegrityError:
+            if attempt == attempts - 1:
+                app.logger.error(f"Failed to record event for job {job_id}: sequence conflict")
+        except SQLAlchemyError as e:
+            app.logger.error(f"Failed to record event for job {job_id}: {str(e)}")
+            return
 
-                success = True
+def stream_job_events(job_id, after=0):
+    """
+    Yield a job's events from index `after` until it finishes. Uses the in-memory
+    job queue when the job runs in this process and polls the job table otherwise.
+    """
+    if job_queue.get(job_id):
+        for event in job_queue.subscribe(job_id, after):
+            yield event
+        return
 
-                yield json.dumps({
-                    'type': 'complete',
-                    'redirect_url': redirect_url
-                }) + '\n'
-            
-            # Track completion
-            if success:
-                track_event('content_analysis_completed', {
-                    'type': 'channel' if channel_id else 'video',
-                    'processing_time': time.time() - start_time,
-                    'new_content': not (existing_report or existing_summary)
-                })
-            else:
-                track_event('content_analysis_failed', {
-                    'type': 'channel' if channel_id else 'video',
-                    'reason': 'processing_failed',
-                    'processing_time': time.time() - start_time
-                })
+    while True:
+        db.session.expire_all()
+        report_job = ReportJob.query.get(job_id)
+        if not report_job:
+            return
 
-        except Exception as e:
-            app.logger.error(f"Error in process_url: {str(e)}", exc_info=True)
-            track_event('content_analysis_failed', {
-                'reason': 'exception',
-                'error_message': str(e),
-                'processing_time': time.time() - start_time
-            })
-            yield json.dumps({'type': 'error', 'message': f'An unexpected error occurred: {str(e)}'}) + '\n'
+        events = report_job.get_events(after)
+        for event in events:
+            yield event
+        after += len(events)
+
+        if report_job.status in ('complete', 'error'):
+            return
+        time.sleep(1)
+
+def fail_interrupted_jobs():
+    """Jobs still queued or running at startup were lost with the previous process."""
+    interrupted = db.session.query(ReportJob.id).filter(ReportJob.status.in_(['queued', 'running'])).all()
+    for report_job in interrupted:
+        record_job_event(report_job.id, {'type': 'error', 'message': 'Analysis was interrupted. Please try again.'})
+        update_report_job(report_job.id, error='interrupted')
+
+@app.route('/process_url', methods=['POST'])
+@login_required
+def process_url():
+    """
+    Queue an analysis job for a channel or video URL and return its ID at once;
+    the client polls /jobs/<job_id>/events. With {"stream": true} the response
+    instead streams the job's progress as NDJSON, holding a server thread until
+    the job finishes.
+    """
+    app.logger.info("Starting /process_url endpoint")
+
+    # Log the incoming request
+    data = request.get_json()
+    app.logger.info(f"Received request data: {data}")
+
+    if not data or 'url' not in data:
+        app.logger.error("Invalid request: Missing URL")
+        return Response(json.dumps({'type': 'error', 'message': 'Invalid request. Please provide a URL.'}) + '\n', content_type='application/json')
+
+    job_id = str(uuid.uuid4())
+    db.session.add(ReportJob(id=job_id, user_id=current_user.id, url=data['url']))
+    db.session.commit()
+    job_queue.submit(job_id, run_analysis_job, current_user.id, data['url'], url_for('dashboard'))
+    app.logger.info(f"Queued analysis job {job_id}")
+
+    events_url = url_for('get_job_events', job_id=job_id)
+    if not data.get('stream'):
+        return jsonify({'job_id': job_id, 'events_url': events_url}), 202
+
+    def generate():
+        yield json.dumps({'type': 'job', 'job_id': job_id, 'events_url': events_url}) + '\n'
+        for event in stream_job_events(job_id):
+            # Blank lines keep idle connections open; the client skips them
+            yield (json.dumps(event) if event else '') + '\n'
 
     return Response(stream_with_context(generate()), content_type='application/json')
 
+@app.route('/jobs/<job_id>/events')
+@login_required
+def get_job_events(job_id):
+    """
+    Return a job's events after index ?after=N without waiting for new ones.
+    While the job runs in this process, model output past character
+    ?output_after=M comes back as 'output' (it is not stored, so it is empty
+    once the job has finished and been dropped from memory).
+    """
+    report_job = ReportJob.query.filter_by(id=job_id, user_id=current_user.id).first()
+    if not report_job:
+        return jsonify({'error': 'Job not found'}), 404
+
+    after = request.args.get('after', 0, type=int)
+    output_after = request.args.get('output_after', 0, type=int)
+    job = job_queue.get(job_id)
+    if job:
+        events, output, done = job.wait_for_events(after, output_after, timeout=0)
+    else:
+        events = report_job.get_events(after)
+        output = ''
+        done = report_job.status in ('complete', 'error')
+
+    return jsonify({
+        'events': events,
+        'next': after + len(events),
+        'output': output,
+        'output_next': output_after + len(output),
+        'done': done
+    })
+
 @app.route('/dashboard')
 @login_required
 def dashboard():
-    # Fetch user's channel report accesses
-    user_report_accesses = UserReportAccess.query.filter_by(user_id=current_user.id).order_by(UserReportAccess.date_accessed.desc()).all()
-    
-    # Fetch video summaries for the current user
-    user_video_accesses = UserVideoAccess.query.filter_by(user_id=current_user.id).order_by(UserVideoAccess.date_accessed.desc()).all()
-    
+    # One page of the user's reports and summaries, most recently accessed first
+    try:
+        cursor = decode_dashboard_cursor(request.args.get('cursor'))
+    except ValueError:
+        cursor = None
+
+    rows = dashboard_page(current_user.id, Config.DASHBOARD_PAGE_SIZE + 1, cursor)
+    next_cursor = None
+    if len(rows) > Config.DASHBOARD_PAGE_SIZE:
+        rows = rows[:Config.DASHBOARD_PAGE_SIZE]
+        next_cursor = encode_dashboard_cursor(rows[-1])
+
     combined_data = []
-    
-    # Process channel reports
-    for access in user_report_accesses:
+    for row in rows:
+        title_key = 'channel_title' if row.type == 'channel_report' else 'video_title'
         combined_data.append({
-            'type': 'channel_report',
-            'item': access.report,
-            'date_accessed': access.date_accessed,
-            'date_created': access.report.date_created
+            'type': row.type,
+            'item': {
+                'id': row.id,
+                title_key: row.title,
+                'avatar_url': row.avatar_url,
+                'banner_url': row.image_url if row.type == 'channel_report' else None,
+                'thumbnail_url': row.image_url if row.type == 'video_summary' else None,
+                'subscriber_count': row.subscriber_count,
+                'video_count': row.video_count,
+                'view_count': row.view_count
+            },
+            'date_accessed': row.date_accessed,
+            'date_created': row.date_created
         })
     
-    # Process video summaries
-    for access in user_video_accesses:
-        combined_data.append({
-            'type': 'video_summary',
-            'item': access.summary,
-            'date_accessed': access.date_accessed,
-            'date_created': access.summary.date_created
-        })
-    
-    # Sort combined data by date accessed, most recent first
-    combined_data.sort(key=lambda x: x['date_created'], reverse=True)
-    
     # Check for new report or summary
     new_report_id = request.args.get('new_report')
     new_summary_id = request.args.get('new_summary')
     
     return render_template('dashboard.html', 
                          combined_data=combined_data,
+                         next_cursor=next_cursor,
                          new_report_id=new_report_id,
                          new_summary_id=new_summary_id)
 
+def dashboard_page(user_id, limit, cursor=None):
+    """
+    Fetch up to `limit` listing rows for a user's reports and summaries in one
+    UNION ALL query, ordered by (date_accessed, type, id) descending.
+    Each branch is limited on its own and walks the (user_id, date_accessed)
+    index, so a page costs the same however many items the user has.
+    `cursor` is the (date_accessed, type, id) of the last row already shown.
+    """
+    def branch(item_type, access, entity, access_fk, title, avatar_url, image_url,
+               subscriber_count, video_count, view_count):
+        query = select(
+            literal(item_type).label('type'),
+            entity.id.label('id'),
+            title.label('title'),
+            avatar_url.label('avatar_url'),
+            image_url.label('image_url'),
+            subscriber_count.label('subscriber_count'),
+            video_count.label('video_count'),
+            view_count.label('view_count'),
+            access.date_accessed.label('date_accessed'),
+            entity.date_created.label('date_created')
+        ).join(entity, access_fk == entity.id).where(access.user_id == user_id)
+
+        if cursor is not None:
+            cursor_date, cursor_type, cursor_id = cursor
+            if item_type < cursor_type:
+                query = query.where(access.date_accessed <= cursor_date)
+            elif item_type > cursor_type:
+                query = query.where(access.date_accessed < cursor_date)
+            else:
+                query = query.where(or_(
+                    access.date_accessed < cursor_date,
+                    and_(access.date_accessed == cursor_date, entity.id < cursor_id)
+                ))
+
+        return query.order_by(access.date_accessed.desc(), entity.id.desc()).limit(limit)
+
+    reports = branch('channel_report', UserReportAccess, ChannelReport, UserReportAccess.report_id,
+                     ChannelReport.channel_title, ChannelReport.avatar_url, ChannelReport.banner_url,
+                     ChannelReport.subscriber_count, ChannelReport.video_count, null())
+    summaries = branch('video_summary', UserVideoAccess, VideoSummary, UserVideoAccess.summary_id,
+                       VideoSummary.video_title, null(), VideoSummary.thumbnail_url,
+                       null(), null(), VideoSummary.view_count)
+
+    page = union_all(reports.subquery().select(), summaries.subquery().select()).subquery()
+    return db.session.execute(
+        select(page).order_by(page.c.date_accessed.desc(), page.c.type.desc(), page.c.id.desc()).limit(limit)
+    ).all()
+
+def encode_dashboard_cursor(row):
+    return base64.urlsafe_b64encode(json.dumps([row.date_accessed.isoformat(), row.type, row.id]).encode()).decode()
+
+def decode_dashboard_cursor(value):
+    """Parse a cursor from encode_dashboard_cursor; raises ValueError if it is malformed."""
+    if not value:
+        return None
+    try:
+        date_accessed, item_type, item_id = json.loads(base64.urlsafe_b64decode(value.encode()))
+        return datetime.fromisoformat(date_accessed), str(item_type), int(item_id)
+    except (TypeError, ValueError, binascii.Error) as e:
+        raise ValueError(f"Invalid dashboard cursor: {value}") from e
+
+# Projections for /report/<id> and /summary/<id>, chosen with ?view=:
+#   header - IDs, dates, categorization and the channel/video header
+#   report - header plus the report/summary itself (what the dashboard modal shows)
+#   full   - report plus the complete raw channel/video data
+RESPONSE_VIEWS = ('header', 'report', 'full')
+
 @app.route('/report/<int:report_id>')
 @login_required
 def get_report(report_id):
+    view = request.args.get('view', 'full')
+    if view not in RESPONSE_VIEWS:
+        return jsonify({'error': f"Unknown view '{view}', expected one of: {', '.join(RESPONSE_VIEWS)}"}), 400
+
     try:
-        report = ChannelReport.query.get(report_id)
+        # Header columns only (a Row, so it isn't refreshed from the DB after the commit below)
+        report = db.session.query(ChannelReport.id, ChannelReport.date_created).filter_by(id=report_id).first()
         user_access = UserReportAccess.query.filter_by(user_id=current_user.id, report_id=report_id).first()
         
         if report and user_access:
             # Update last access time
             user_access.date_accessed = get_local_time()
             db.session.commit()
-            
-            return jsonify({
-                'report': json.loads(report.report_data),
-                'raw_channel_data': json.loads(report.raw_channel_data) if report.raw_channel_data else None,
-                'date_created': report.date_created.isoformat(),
-                'categorization': report.get_categorization(),
-                'report_id': report_id  # Add this line
-            })
+
+            def build_body():
+                # Only the columns the view needs are read, and stored JSON is spliced in as-is
+                columns = [ChannelReport.header_data, ChannelReport.content_categories,
+                           ChannelReport.video_formats, ChannelReport.content_category_justification]
+                if view in ('report', 'full'):
+                    columns.append(ChannelReport.report_data)
+                if view == 'full':
+                    columns.append(ChannelReport.raw_channel_data)
+                row = db.session.query(*columns).filter_by(id=report_id).one()
+
+                fields = {}
+                if view in ('report', 'full'):
+                    fields['report'] = RawJSON(row.report_data)
+                # The header has the same keys as raw_channel_data, so it stands in for it
+                fields['raw_channel_data'] = RawJSON(row.raw_channel_data if view == 'full' else row.header_data)
+                fields.update({
+                    'date_created': report.date_created.isoformat(),
+                    'categorization': {
+                        'content_categories': row.content_categories,
+                        'video_formats': row.video_formats,
+                        'content_category_justification': row.content_category_justification,
+                    },
+                    'report_id': report_id,
+                    'view': view
+                })
+                return splice_json_object(fields)
+
+            return stored_json_response(f'report.{view}', report_id, report.date_created, build_body)
         else:
             app.logger.warning(f"Report {report_id} not found or access denied for user {current_user.id}")
             return jsonify({'error': 'Report not found or access denied'}), 404
@@ -1132,20 +1605,40 @@ def get_report(report_id):
 @app.route('/summary/<int:summary_id>')
 @login_required
 def get_summary(summary_id):
+    view = request.args.get('view', 'full')
+    if view not in RESPONSE_VIEWS:
+        return jsonify({'error': f"Unknown view '{view}', expected one of: {', '.join(RESPONSE_VIEWS)}"}), 400
+
     try:
-        summary = VideoSummary.query.get(summary_id)
+        summary = db.session.query(
+            VideoSummary.id, VideoSummary.video_id, VideoSummary.video_title, VideoSummary.date_created
+        ).filter_by(id=summary_id).first()
         if summary:
             # Check if the current user has access to this summary
             user_access = UserVideoAccess.query.filter_by(user_id=current_user.id, summary_id=summary_id).first()
             if user_access:
-                return jsonify({
-                    'summary': json.loads(summary.summary_data),
-                    'video_id': summary.video_id,
-                    'video_title': summary.video_title,
-                    'date_created': summary.date_created.isoformat(),
-                    'raw_data': json.loads(summary.raw_video_data),
-                    'summary_id': summary_id  # Add this line
-                })
+                def build_body():
+                    columns = [VideoSummary.header_data]
+                    if view in ('report', 'full'):
+                        columns.append(VideoSummary.summary_data)
+                    if view == 'full':
+                        columns.append(VideoSummary.raw_video_data)
+                    row = db.session.query(*columns).filter_by(id=summary_id).one()
+
+                    fields = {}
+                    if view in ('report', 'full'):
+                        fields['summary'] = RawJSON(row.summary_data)
+                    fields.update({
+                        'video_id': summary.video_id,
+                        'video_title': summary.video_title,
+                        'date_created': summary.date_created.isoformat(),
+                        'raw_data': RawJSON(row.raw_video_data if view == 'full' else row.header_data),
+                        'summary_id': summary_id,
+                        'view': view
+                    })
+                    return splice_json_object(fields)
+
+                return stored_json_response(f'summary.{view}', summary_id, summary.date_created, build_body)
             else:
                 app.logger.warning(f"User {current_user.id} attempted to access summary {summary_id} without permission")
                 return jsonify({'error': 'Access denied'}), 403
@@ -1155,13 +1648,49 @@ def get_summary(summary_id):
     except Exception as e:
         app.logger.error(f"Error in get_summary: {str(e)}")
         return jsonify({'error': 'An unexpected error occurred'}), 500
-    
+
+def stored_json_response(kind, item_id, date_created, build_body):
+    """
+    Respond with a stored report/summary as JSON. The row is immutable, so its
+    ETag comes from its identity: a matching If-None-Match gets a 304 without the
+    payload columns being read. Compressed bodies (br or gzip, per Accept-Encoding)
+    are built once and kept in compressed_response; build_body() runs on a miss.
+    """
+    encoding = choose_encoding(request.accept_encodings)
+    etag = row_etag(kind, item_id, date_created, f"-{encoding or 'identity'}")
+    if request.if_none_match.contains(etag):
+        return not_modified(etag)
+
+    if encoding is None:
+        return json_response(build_body(), etag)
+
+    body = db.session.query(CompressedResponse.body) \
+        .filter_by(kind=kind, item_id=item_id, encoding=encoding, etag=etag).scalar()
+    if body is None:
+        body = compress(build_body(), encoding)
+        store_compressed_response(kind, item_id, encoding, etag, body)
+
+    return json_response(body, etag, encoding)
+
+def store_compressed_response(kind, item_id, encoding, etag, body):
+    """Save a compressed body, replacing one for an older response format."""
+    try:
+        CompressedResponse.query.filter_by(kind=kind, item_id=item_id, encoding=encoding).delete()
+        db.session.add(CompressedResponse(kind=kind, item_id=item_id, encoding=encoding, etag=etag, body=body))
+        db.session.commit()
+    except IntegrityError:
+        # Another request stored it first
+        db.session.rollback()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        app.logger.warning(f"Could not store compressed {kind} {item_id}: {str(e)}")
 
 
 # Run the app (dev mode only)
 if __name__ == '__main__':
     with app.app_context():
         db.create_all()  # Create database tables before running the app
+        fail_interrupted_jobs()
     # app.run(host='0.0.0.0', port=5000, debug=True)  # Run in debug mode for development
 
     # Production-like server but still easy to run
@@ -0,0 +1,108 @@
+# channel_metrics.py
+from datetime import datetime
+import numpy as np
+
+SHORT_VIDEO_SECONDS = 60
+LONG_VIDEO_SECONDS = 20 * 60
+
+def parse_published(value):
+    """Days since the epoch for a YouTube publishedAt timestamp."""
+    return datetime.strptime(value[:19], '%Y-%m-%dT%H:%M:%S').timestamp() / 86400
+
+def rounded(value, digits=1):
+    if value is None or np.isnan(value):
+        return None
+    return int(round(float(value))) if digits == 0 else round(float(value), digits)
+
+def compute_channel_metrics(videos):
+    """
+    Compute the channel statistics the report relies on from the video list, in
+    one vectorized pass: view distribution, engagement, upload cadence, outliers,
+    views by video length and the trend in views over the period covered.
+
+    The videos are not modified, so the metrics never end up in the stored
+    channel data.
+
+    Returns:
+        tuple: (stats, video_metrics) - the stats block for the prompt, and per
+        video (in the same order) a dict with 'views_vs_median',
+        'engagement_rate' and, for outliers, 'view_outlier' ('high' or 'low').
+        ({}, []) if there are no videos.
+    """
+    if not videos:
+        return {}, []
+
+    views = np.array([video.get('views', 0) for video in videos], dtype=float)
+    likes = np.array([video.get('like_count', 0) for video in videos], dtype=float)
+    comments = np.array([video.get('comment_count', 0) for video in videos], dtype=float)
+    lengths = np.array([video.get('length', 0) for video in videos], dtype=float)
+    days = np.array([parse_published(video['date_published']) for video in videos])
+
+    median_views = np.median(views)
+    engagement = np.divide(likes + comments, views, out=np.zeros_like(views), where=views > 0)
+    views_vs_median = views / median_views if median_views > 0 else np.zeros_like(views)
+
+    # Outliers by Tukey's fences on log views, since view counts are heavy-tailed
+    log_views = np.log10(views + 1)
+    q1, q3 = np.percentile(log_views, [25, 75])
+    fence = 1.5 * (q3 - q1)
+    high = log_views > q3 + fence
+    low = log_views < q1 - fence
+
+    video_metrics = []
+    for i in range(len(videos)):
+        metrics = {
+            'views_vs_median': round(float(views_vs_median[i]), 2),
+            'engagement_rate': round(float(engagement[i]), 4)
+        }
+        if high[i]:
+            metrics['view_outlier'] = 'high'
+        elif low[i]:
+            metrics['view_outlier'] = 'low'
+        video_metrics.append(metrics)
+
+    # Upload cadence over the span of the fetched videos
+    span_days = days.max() - days.min()
+    gaps = np.diff(np.sort(days))
+    uploads_per_week = len(videos) / (span_days / 7) if span_days > 0 else None
+
+    # Trend: slope of log views against publish date, as % change per 30 days.
+    # Newer videos have had less time to collect views, which biases this downward.
+    trend = None
+    if len(videos) >= 3 and span_days > 0:
+        slope, _ = np.polyfit(days - days.min(), log_views, 1)
+        trend = (10 ** (slope * 30) - 1) * 100
+
+    length_buckets = {
+        'short': lengths <= SHORT_VIDEO_SECONDS,
+        'medium': (lengths > SHORT_VIDEO_SECONDS) & (lengths < LONG_VIDEO_SECONDS),
+        'long': lengths >= LONG_VIDEO_SECONDS
+    }
+
+    p10, p25, p75, p90 = np.percentile(views, [10, 25, 75, 90])
+    stats = {
+        'video_count': len(videos),
+        'period_days': rounded(span_days, 0),
+        'views_mean': rounded(views.mean(), 0),
+        'views_median': rounded(median_views, 0),
+        'views_p10': rounded(p10, 0),
+        'views_p25': rounded(p25, 0),
+        'views_p75': rounded(p75, 0),
+        'views_p90': rounded(p90, 0),
+        'views_max': rounded(views.max(), 0),
+        'likes_median': rounded(np.median(likes), 0),
+        'comments_median': rounded(np.median(comments), 0),
+        'engagement_rate_overall_pct': rounded(100 * (likes.sum() + comments.sum()) / views.sum(), 2) if views.sum() > 0 else None,
+        'engagement_rate_median_pct': rounded(100 * np.median(engagement), 2),
+        'length_median_s': rounded(np.median(lengths), 0),
+        'uploads_per_week': rounded(uploads_per_week, 2),
+        'days_between_uploads_median': rounded(np.median(gaps), 1) if len(gaps) else None,
+        'views_trend_pct_per_30_days': rounded(trend, 1),
+        'high_outliers': int(high.sum()),
+        'low_outliers': int(low.sum()),
+        'views_median_by_length': {
+            name: {'videos': int(mask.sum()), 'views_median': rounded(np.median(views[mask]), 0)}
+            for name, mask in length_buckets.items() if mask.any()
+        }
+    }
+    return stats, video_metrics
@@ -7,21 +7,49 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16 MB max-limit
     IMAGES_FOLDER = 'i'
+    DEBUG_ARTIFACTS_FOLDER = 'debug_artifacts'
+    DEBUG_ARTIFACT_SAMPLE_RATE = float(os.environ.get('DEBUG_ARTIFACT_SAMPLE_RATE', 0)) # share of jobs whose prompts, output and transcripts are kept
+    DEBUG_ARTIFACT_MAX_AGE = 3 * 24 * 3600 # seconds
+    DEBUG_ARTIFACT_MAX_SCOPES = 200 # most recent jobs kept
+    DASHBOARD_PAGE_SIZE = 24 # reports and summaries per dashboard page
+    REPORT_WORKERS = 4 # background threads generating channel reports and video summaries
+    EXPORT_WORKERS = 2 # processes rendering PDF/Markdown exports
+    EXPORT_RENDER_TIMEOUT = 60 # seconds a download waits for its export to render
+    EXPORT_PRERENDER = True # render exports as soon as a report or summary is created
     
     # Google Analytics configuration
     GA4_API_SECRET = os.environ.get('GA4_API_SECRET')
     GOOGLE_ANALYTICS_ID = os.environ.get('GOOGLE_ANALYTICS_ID')
+    GA4_COLLECT_URL = os.environ.get('GA4_COLLECT_URL', 'https://www.google-analytics.com/mp/collect') # point at a local collector to test
+    ANALYTICS_QUEUE_SIZE = 1000 # events waiting to be sent before new ones are dropped
+    ANALYTICS_FLUSH_INTERVAL = 5 # seconds a partial batch of events waits before it is sent
 
     # YouTube API configuration
     YOUTUBE_API_KEY = os.environ.get('YOUTUBE_API_KEY')
     MAX_VIDEOS_TO_FETCH = 40
+    CHANNEL_VIDEO_SOURCE = 'uploads' # 'uploads' (playlistItems, 1 unit/page) or 'search' (search.list, 100 units/page)
     MAX_VIDEOS_FOR_SUBTITLES = 5
+    SUBTITLE_FETCH_WORKERS = 5 # concurrent yt-dlp subtitle fetches per channel report
+    SUBTITLE_FETCH_TIMEOUT = 30 # seconds allowed per video
+    TRANSCRIPT_CACHE_TTL = 30 * 24 * 3600 # seconds before a cached transcript is refetched
+    TRANSCRIPT_CACHE_MAX_ENTRIES = 5000
+    TRANSCRIPT_TOKEN_BUDGET = 10000 # prompt tokens shared by all transcripts in a channel report
+    TRANSCRIPT_WINDOW_TOKENS = 250 # size of each excerpt taken from a transcript that is over its share
+    CHANNEL_ID_CACHE_TTL = 7 * 24 * 3600 # seconds a handle/custom URL -> channel ID mapping is trusted
+    CHANNEL_ID_CACHE_MAX_ENTRIES = 20000
 
     # OpenAI configuration
     OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
     OPENAI_MODEL = 'gpt-4o-mini'
     # OPENAI_MODEL = 'o1-mini'
     MAX_TOKENS = 8000
+    COMPLETION_CACHE_TTL = 7 * 24 * 3600 # seconds an identical OpenAI request is answered from the cache
+    COMPLETION_CACHE_MAX_ENTRIES = 2000
+    REPORT_GENERATION_MODE = 'sections' # 'sections' (one completion per report section, in parallel) or 'single'
+    REPORT_SECTION_WORKERS = 7 # concurrent section completions per channel report
+    SUMMARY_CHUNK_THRESHOLD = 12000 # transcript tokens above which video summaries use chunked map-reduce
+    SUMMARY_CHUNK_TOKENS = 6000 # transcript tokens per chunk in the map step
+    SUMMARY_MAP_WORKERS = 4 # concurrent chunk summaries per video
 
     # Mail settings
     MAIL_SERVER = 'smtp.gmail.com'
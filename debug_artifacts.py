@@ -0,0 +1,152 @@
+# debug_artifacts.py
+import os
+import re
+import gzip
+import time
+import uuid
+import queue
+import random
+import atexit
+import logging
+import threading
+from contextlib import contextmanager
+from config import Config
+
+ARTIFACTS_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), Config.DEBUG_ARTIFACTS_FOLDER)
+PRUNE_EVERY = 20 # writes between retention sweeps
+
+class ArtifactWriter:
+    """
+    Background writer for debug artifacts (prompts, model output, transcripts).
+    record() only enqueues; a daemon thread gzips each artifact to
+    <folder>/<scope>/<name>.txt.gz and keeps the folder within the retention
+    limits. When the queue is full, artifacts are dropped rather than making
+    the caller wait.
+    """
+
+    def __init__(self, folder=ARTIFACTS_FOLDER, max_age=Config.DEBUG_ARTIFACT_MAX_AGE,
+                 max_scopes=Config.DEBUG_ARTIFACT_MAX_SCOPES, queue_size=100):
+        self.folder = folder
+        self.max_age = max_age
+        self.max_scopes = max_scopes
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='debug-artifacts', daemon=True)
+                self._thread.start()
+
+    def submit(self, scope, name, content):
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((scope, name, content))
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        writes = 0
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            try:
+                self._write(*item)
+                writes += 1
+                if writes % PRUNE_EVERY == 0:
+                    self.prune()
+            except Exception as e:
+                logging.warning(f"Could not write debug artifact {item[1]}: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, scope, name, content):
+        directory = os.path.join(self.folder, scope)
+        os.makedirs(directory, exist_ok=True)
+        with gzip.open(os.path.join(directory, f"{name}.txt.gz"), 'wt', encoding='utf-8') as file:
+            file.write(content)
+
+    def prune(self):
+        """Delete scope folders older than max_age, then the oldest beyond max_scopes."""
+        if not os.path.isdir(self.folder):
+            return
+        scopes = sorted(
+            (entry for entry in os.scandir(self.folder) if entry.is_dir()),
+            key=lambda entry: entry.stat().st_mtime,
+            reverse=True
+        )
+        cutoff = time.time() - self.max_age
+        for index, entry in enumerate(scopes):
+            if index >= self.max_scopes or entry.stat().st_mtime < cutoff:
+                for file in os.scandir(entry.path):
+                    os.remove(file.path)
+                os.rmdir(entry.path)
+
+    def close(self, timeout=5):
+        """Write out what is queued (waiting up to timeout seconds) and stop the thread."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+writer = ArtifactWriter()
+atexit.register(writer.close)
+
+# The scope (job ID) artifacts on this thread are filed under, and whether it was sampled
+_scope = threading.local()
+
+@contextmanager
+def artifact_scope(scope_id):
+    """
+    File artifacts recorded on this thread inside the block under scope_id
+    (e.g. the job ID). The sampling decision is made once for the whole scope,
+    so a sampled job keeps all of its artifacts.
+    """
+    previous = getattr(_scope, 'current', None)
+    _scope.current = (scope_id, random.random() < Config.DEBUG_ARTIFACT_SAMPLE_RATE)
+    try:
+        yield
+    finally:
+        _scope.current = previous
+
+def capture_scope():
+    """This thread's artifact scope, to hand to work it runs on other threads (see in_scope)."""
+    return getattr(_scope, 'current', None)
+
+def in_scope(captured, fn):
+    """
+    Wrap fn to run under a scope captured with capture_scope(), e.g. in a pool
+    worker, so its artifacts are filed with (and sampled like) the job's.
+    """
+    def run(*args, **kwargs):
+        previous = getattr(_scope, 'current', None)
+        _scope.current = captured
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _scope.current = previous
+    return run
+
+def record(name, content):
+    """
+    Queue a debug artifact for writing. Outside an artifact_scope each call is
+    sampled on its own and filed under a one-off scope. With the sample rate at
+    0 this returns before touching the disk or the queue.
+    """
+    if Config.DEBUG_ARTIFACT_SAMPLE_RATE <= 0 or not content:
+        return
+
+    current = getattr(_scope, 'current', None)
+    if current is None:
+        if random.random() >= Config.DEBUG_ARTIFACT_SAMPLE_RATE:
+            return
+        scope_id = f"{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+    else:
+        scope_id, sampled = current
+        if not sampled:
+            return
+
+    writer.submit(re.sub(r'[^\w.-]', '_', str(scope_id)), re.sub(r'[^\w.-]', '_', name), content)
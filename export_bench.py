@@ -0,0 +1,132 @@
+# export_bench.py
+# Times PDF/Markdown export rendering over generated sample reports and summaries.
+# The samples are built from a fixed seed, so runs on different trees render the same input.
+# Usage: python export_bench.py [samples per kind] [rounds] [seed]
+import sys
+import time
+import random
+import statistics
+from export_utils import (generate_channel_report_pdf, generate_video_summary_pdf,
+                          generate_channel_report_markdown, generate_video_summary_markdown)
+
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+seed = int(sys.argv[3]) if len(sys.argv) > 3 else 2024
+
+WORDS = (
+    "audience retention thumbnail upload schedule engagement comments community "
+    "creator analytics watch time shorts playlist sponsor segment tutorial review "
+    "growth consistent editing pacing hook storytelling viewers channel niche brand "
+    "collaboration trend algorithm impressions click-through rate subscribers format "
+    "the a of to and in with for on that this their more than your it is are"
+).split()
+
+REPORT_SECTIONS = ('Content Strategy', 'Audience Engagement', 'Production Quality', 'Growth Opportunities')
+REPORT_SUBSECTIONS = ('Strengths', 'Weaknesses', 'Recommendations')
+
+def sentence(rng, low=8, high=24):
+    words = [rng.choice(WORDS) for _ in range(rng.randint(low, high))]
+    return ' '.join(words).capitalize() + '.'
+
+def paragraph(rng, sentences=(3, 7)):
+    return ' '.join(sentence(rng) for _ in range(rng.randint(*sentences)))
+
+def text(rng, paragraphs=(2, 4)):
+    return '\n'.join(paragraph(rng) for _ in range(rng.randint(*paragraphs)))
+
+def channel_sample(rng, i):
+    sections = [
+        {'subtitle': title, 'content': [{'sections': [
+            {'subtitle': f"{title}: {sub}", 'content': text(rng)} for sub in REPORT_SUBSECTIONS
+        ]}]}
+        for title in REPORT_SECTIONS
+    ]
+    sections.append({'subtitle': 'Limitations', 'content': paragraph(rng)})
+    report = {'consultation_report': {
+        'sections': sections,
+        'categorisation': [{
+            'content_categories': [rng.choice(WORDS).title() for _ in range(3)],
+            'video_formats': [rng.choice(WORDS).title() for _ in range(2)],
+            'content_category_justification': paragraph(rng)
+        }]
+    }}
+    channel = {
+        'title': f"Sample Channel {i}",
+        'subscriber_count': rng.randint(1_000, 5_000_000),
+        'total_view_count': rng.randint(100_000, 900_000_000),
+        'total_video_count': rng.randint(10, 2_000)
+    }
+    return report, channel
+
+def video_sample(rng, i):
+    summary = {
+        'title': f"Sample Video {i}",
+        'overview': text(rng),
+        'key_points': [{'point_title': sentence(rng, 3, 6), 'point_description': paragraph(rng)} for _ in range(5)],
+        'engagement_analysis': text(rng),
+        'discourse_summary': text(rng),
+        'discourse_themes': [{'theme_title': sentence(rng, 2, 5), 'theme_description': paragraph(rng)} for _ in range(4)],
+        'target_audience': paragraph(rng),
+        'improvement_suggestions': [
+            {'improvement_title': sentence(rng, 3, 6), 'improvement_description': paragraph(rng)} for _ in range(4)
+        ]
+    }
+    video = {
+        'views': rng.randint(1_000, 10_000_000),
+        'like_count': rng.randint(10, 500_000),
+        'comment_count': rng.randint(0, 50_000),
+        'date_published': '2024-06-01T12:00:00Z'
+    }
+    return summary, video
+
+def load_samples():
+    rng = random.Random(seed)
+    return [('report',) + channel_sample(rng, i) for i in range(count)] + \
+           [('summary',) + video_sample(rng, i) for i in range(count)]
+
+GENERATORS = {
+    'report': (generate_channel_report_pdf, generate_channel_report_markdown),
+    'summary': (generate_video_summary_pdf, generate_video_summary_markdown)
+}
+
+def bench(samples):
+    """
+    Render every sample `rounds` times; returns {(kind, stage): [seconds]}. The
+    PDF is timed as layout (building the FPDF document), output (serialising
+    it, which subsets the fonts) and both together.
+    """
+    timings = {}
+    def record(kind, stage, seconds):
+        timings.setdefault((kind, stage), []).append(seconds)
+
+    for _ in range(rounds):
+        for kind, data, raw_data in samples:
+            generate_pdf, generate_markdown = GENERATORS[kind]
+
+            started = time.perf_counter()
+            pdf = generate_pdf(data, raw_data)
+            laid_out = time.perf_counter()
+            pdf.output(dest='S').encode('latin-1')
+            finished = time.perf_counter()
+            record(kind, 'pdf layout', laid_out - started)
+            record(kind, 'pdf output', finished - laid_out)
+            record(kind, 'pdf total', finished - started)
+
+            started = time.perf_counter()
+            generate_markdown(data, raw_data).encode('utf-8')
+            record(kind, 'markdown', time.perf_counter() - started)
+    return timings
+
+if __name__ == '__main__':
+    samples = load_samples()
+
+    # First render in the process (font loading etc.), reported separately
+    kind, data, raw_data = samples[0]
+    started = time.perf_counter()
+    GENERATORS[kind][0](data, raw_data).output(dest='S')
+    print(f"first render: {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    for (kind, stage), seconds in sorted(bench(samples).items()):
+        ms = sorted(s * 1000 for s in seconds)
+        print(f"{kind:8} {stage:11} n={len(ms):<4} mean={statistics.mean(ms):8.1f} ms  "
+              f"p50={statistics.median(ms):8.1f} ms  max={ms[-1]:8.1f} ms")
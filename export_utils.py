@@ -1,14 +1,82 @@
 from fpdf import FPDF
 import json
-import textwrap
 import re
+import functools
+import threading
+
+# Bump when rendering changes, so stored exports are rendered again
+EXPORT_RENDER_VERSION = 2
+
+EXPORT_FORMATS = {
+    # format: (mimetype, file extension)
+    'pdf': ('application/pdf', 'pdf'),
+    'markdown': ('text/markdown', 'md')
+}
+
+# Unicode faces used by ReportPDF: (family, style, TTF path)
+REPORT_FONTS = (
+    ('DejaVu', '', 'fonts/DejaVuSansCondensed.ttf'),
+    ('DejaVu', 'B', 'fonts/DejaVuSansCondensed-Bold.ttf')
+)
+
+# FontRegistry works on fpdf 1.7.2 internals that are not public API: the
+# FPDF.fonts and FPDF.font_files dicts, and each font entry's 'subset' (glyphs
+# used, read by output() when subsetting), 'cw' (glyph widths) and 'desc' keys.
+# fpdf is pinned to 1.7.2 in requirements.txt; check these when upgrading it.
+class FontRegistry:
+    """
+    TrueType font metrics loaded once per process and shared by every ReportPDF.
+    FPDF.add_font() unpickles a face's metrics (65536 glyph widths) each time it
+    is called; install() copies the already loaded entries into a document
+    instead, giving it its own list of used glyphs for subsetting.
+    """
+
+    def __init__(self, fonts):
+        self.fonts = fonts
+        self._entries = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Load every face through FPDF.add_font once; returns (fonts, font_files)."""
+        with self._lock:
+            if self._entries is None:
+                loader = FPDF()
+                for family, style, path in self.fonts:
+                    loader.add_font(family, style, path, uni=True)
+                self._entries = (loader.fonts, loader.font_files)
+            return self._entries
+
+    def install(self, pdf):
+        fonts, font_files = self.load()
+        for fontkey, font in fonts.items():
+            pdf.fonts[fontkey] = dict(font, i=len(pdf.fonts) + 1, subset=list(font['subset']))
+        for name, font_file in font_files.items():
+            pdf.font_files[name] = dict(font_file)
+
+    def glyph_widths(self, fontkey):
+        return self.load()[0][fontkey]['cw']
+
+    def missing_width(self, fontkey):
+        return self.load()[0][fontkey]['desc']['MissingWidth'] or 500
+
+font_registry = FontRegistry(REPORT_FONTS)
+
+def preload_fonts():
+    """Export pool initializer: load the fonts before the first render."""
+    font_registry.load()
+
+@functools.lru_cache(maxsize=50000)
+def text_width(fontkey, text):
+    """Width of text in thousandths of the font size, like FPDF.get_string_width."""
+    widths = font_registry.glyph_widths(fontkey)
+    missing = font_registry.missing_width(fontkey)
+    return sum(widths[code] if code < len(widths) else missing for code in map(ord, text))
 
 class ReportPDF(FPDF):
     def __init__(self):
         super().__init__()
         # Add Unicode font support
-        self.add_font('DejaVu', '', 'fonts/DejaVuSansCondensed.ttf', uni=True)
-        self.add_font('DejaVu', 'B', 'fonts/DejaVuSansCondensed-Bold.ttf', uni=True)
+        font_registry.install(self)
         self.set_auto_page_break(auto=True, margin=5)
         self.add_page()
         self.set_font('DejaVu', size=10)
@@ -42,19 +110,53 @@ class ReportPDF(FPDF):
         # Handle content paragraphs
         paragraphs = content.split('\n')
         for paragraph in paragraphs:
-            # Wrap text to fit page width (adjust width based on font)
-            wrapped_text = textwrap.fill(paragraph, width=100)  # Reduced width for larger font
-            
-            for line in wrapped_text.split('\n'):
+            for line in self.wrap_paragraph(paragraph):
                 if self._current_y > 270:  # Check for page break
                     self.add_page()
                     self._current_y = 20
                 self.set_y(self._current_y)
-                self.multi_cell(0, 10, line)
+                self.cell(0, 10, line, ln=1)
                 self._current_y = self.get_y()
             
             self._current_y += 2  # Space between paragraphs
 
+    def wrap_paragraph(self, paragraph):
+        """
+        Break a paragraph into lines that fit between the margins in the current
+        font, measuring each word once with the shared glyph widths. Words too
+        long for a line are split. A blank paragraph is one empty line.
+        """
+        fontkey = self.current_font['fontkey']
+        max_width = (self.w - self.l_margin - self.r_margin - 2 * self.c_margin) * 1000 / self.font_size
+        space = text_width(fontkey, ' ')
+
+        lines = []
+        line = []
+        line_width = 0
+        for word in paragraph.split():
+            word_width = text_width(fontkey, word)
+            if line and line_width + space + word_width > max_width:
+                lines.append(' '.join(line))
+                line, line_width = [], 0
+
+            while word_width > max_width:
+                # Split an overlong word at the last character that still fits
+                end = len(word) - 1
+                while end > 1 and text_width(fontkey, word[:end]) > max_width:
+                    end -= 1
+                lines.append(word[:end])
+                word = word[end:]
+                word_width = text_width(fontkey, word)
+
+            if line:
+                line_width += space
+            line.append(word)
+            line_width += word_width
+
+        if line:
+            lines.append(' '.join(line))
+        return lines or ['']
+
     def clean_text(self, text):
         """Clean text for PDF compatibility"""
         # Replace bullet points with dashes
@@ -286,4 +388,4 @@ def generate_video_summary_markdown(summary_data, raw_video_data):
         markdown.append(f"### {suggestion['improvement_title']}")
         markdown.append(f"{suggestion['improvement_description']}\n")
 
-    return "\n".join(markdown)
\ No newline at end of file
+    return "\n".join(markdown)
@@ -0,0 +1,79 @@
+# export_worker.py
+# Entry point of the export process pool. Keep this module's imports to the
+# renderers (export_utils) and config: spawned workers import it as their main
+# module, so nothing from app may be pulled in here.
+import sys
+import atexit
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.context import SpawnContext, SpawnProcess
+from config import Config
+from export_utils import (EXPORT_FORMATS, preload_fonts,
+                          generate_channel_report_pdf, generate_video_summary_pdf,
+                          generate_channel_report_markdown, generate_video_summary_markdown)
+
+def render_export(kind, format, data, raw_data):
+    """
+    Render a channel report (kind 'report') or video summary (kind 'summary')
+    export to bytes. Runs in the export process pool, so it only takes and
+    returns plain values.
+    """
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {format}")
+
+    if kind == 'report':
+        if format == 'pdf':
+            return generate_channel_report_pdf(data, raw_data).output(dest='S').encode('latin-1')
+        return generate_channel_report_markdown(data, raw_data).encode('utf-8')
+    if kind == 'summary':
+        if format == 'pdf':
+            return generate_video_summary_pdf(data, raw_data).output(dest='S').encode('latin-1')
+        return generate_video_summary_markdown(data, raw_data).encode('utf-8')
+    raise ValueError(f"Unknown export kind: {kind}")
+
+_spawn_lock = threading.Lock()
+
+class ExportWorkerProcess(SpawnProcess):
+    """
+    A spawned process that starts from this module instead of the parent's
+    __main__. multiprocessing tells a spawned child to import whatever module
+    is __main__ in the parent (app.py when run as `python app.py`), which would
+    build a second Flask app, database engine and job queue in every worker.
+    __main__ is pointed here only while the child's start-up data is written.
+    """
+
+    def start(self):
+        with _spawn_lock:
+            main = sys.modules['__main__']
+            sys.modules['__main__'] = sys.modules[__name__]
+            try:
+                super().start()
+            finally:
+                sys.modules['__main__'] = main
+
+class ExportWorkerContext(SpawnContext):
+    Process = ExportWorkerProcess
+
+_export_pool = None
+_export_pool_lock = threading.Lock()
+
+def export_pool():
+    """
+    The process pool exports are rendered in, so PDF layout doesn't hold the
+    GIL while web threads are serving. Workers are spawned rather than forked
+    from the threaded server, started on first use, and load the fonts up front.
+    """
+    global _export_pool
+    with _export_pool_lock:
+        if _export_pool is None:
+            _export_pool = ProcessPoolExecutor(
+                max_workers=Config.EXPORT_WORKERS,
+                mp_context=ExportWorkerContext(),
+                initializer=preload_fonts
+            )
+            atexit.register(_export_pool.shutdown, wait=False, cancel_futures=True)
+        return _export_pool
+
+def render_export_async(kind, format, data, raw_data):
+    """Queue render_export() on the export pool and return its Future."""
+    return export_pool().submit(render_export, kind, format, data, raw_data)
@@ -0,0 +1,140 @@
+# job_queue.py
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+# Event types that end a job's progress stream
+TERMINAL_EVENT_TYPES = ('complete', 'error')
+
+# Streamed model output; kept apart from the indexed events (see Job)
+PARTIAL_EVENT_TYPE = 'partial'
+
+class Job:
+    """
+    In-memory state of a queued or running job: an append-only list of progress
+    events (the same dicts the NDJSON endpoints send) and a completion flag.
+    Any number of readers can wait on it and replay events from any offset.
+
+    'partial' events (streamed model output) are not indexed events: their text
+    is appended to `output`, which readers follow by character offset. That way
+    event indexes match the sequence stored in the job table, which has no
+    partials, and stay valid once the job has been pruned from memory.
+    """
+
+    def __init__(self, job_id):
+        self.id = job_id
+        self.events = []
+        self.output = ''
+        self.done = False
+        self.detached = False
+        self.finished_at = None
+        self._condition = threading.Condition()
+
+    def emit(self, event):
+        with self._condition:
+            if event.get('type') == PARTIAL_EVENT_TYPE:
+                self.output += event.get('content', '')
+            else:
+                self.events.append(event)
+            if event.get('type') in TERMINAL_EVENT_TYPES:
+                self.done = True
+            self._condition.notify_all()
+
+    def detach(self):
+        """
+        Hand the job off: the worker function returns without the job being
+        finished, and whoever it was handed to must call finish().
+        """
+        with self._condition:
+            self.detached = True
+
+    def finish(self):
+        with self._condition:
+            self.done = True
+            self.finished_at = time.monotonic()
+            self._condition.notify_all()
+
+    def wait_for_events(self, after=0, output_after=None, timeout=None):
+        """
+        Wait until there are events past index `after`, output past character
+        `output_after` (if given) or the job is done.
+        Returns (new_events, new_output, done).
+        """
+        def ready():
+            return (len(self.events) > after or self.done
+                    or (output_after is not None and len(self.output) > output_after))
+
+        with self._condition:
+            self._condition.wait_for(ready, timeout=timeout)
+            new_output = self.output[output_after:] if output_after is not None else ''
+            return self.events[after:], new_output, self.done
+
+class JobQueue:
+    """
+    Local worker pool for long-running report jobs.
+    submit() returns immediately; the work runs on one of `max_workers` threads and
+    reports progress through its Job, which web requests subscribe to.
+    Finished jobs stay subscribable for `retention` seconds.
+    """
+
+    def __init__(self, max_workers, retention=600):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='report-job')
+        self.retention = retention
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, job_id, fn, *args, **kwargs):
+        """Queue fn(job, *args, **kwargs) on the worker pool and return its Job."""
+        job = Job(job_id)
+        with self._lock:
+            self._prune()
+            self._jobs[job_id] = job
+        self.executor.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def _run(self, job, fn, args, kwargs):
+        try:
+            fn(job, *args, **kwargs)
+        except Exception as e:
+            logging.error(f"Job {job.id} failed: {str(e)}", exc_info=True)
+            job.emit({'type': 'error', 'message': f'An unexpected error occurred: {str(e)}'})
+            job.finish()
+        else:
+            if not job.detached:
+                job.finish()
+
+    def _prune(self):
+        cutoff = time.monotonic() - self.retention
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished_at and job.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def subscribe(self, job_id, after=0, heartbeat=15):
+        """
+        Yield a job's events from index `after` until it finishes, with new model
+        output in between as 'partial' events.
+        Yields None every `heartbeat` seconds without news so callers can keep
+        connections alive.
+        """
+        job = self.get(job_id)
+        if job is None:
+            return
+
+        output_after = 0
+        while True:
+            events, output, done = job.wait_for_events(after, output_after, timeout=heartbeat)
+            if output:
+                output_after += len(output)
+                yield {'type': PARTIAL_EVENT_TYPE, 'content': output, 'chars': output_after}
+            for event in events:
+                yield event
+            after += len(events)
+
+            if done and len(job.events) <= after:
+                return
+            if not events and not output:
+                yield None
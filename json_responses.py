@@ -0,0 +1,69 @@
+# json_responses.py
+import gzip
+import json
+from flask import Response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bump when the shape of a spliced response changes, so clients' ETags stop matching
+RESPONSE_FORMAT_VERSION = 1
+
+class RawJSON:
+    """Text that is already serialized JSON (e.g. a stored column), spliced in as-is."""
+
+    def __init__(self, text):
+        self.text = text
+
+def splice_json_object(fields):
+    """
+    Build a JSON object from a dict, writing RawJSON values verbatim and
+    json.dumps()-ing the rest, so stored JSON is never parsed and re-encoded.
+    A RawJSON of None or '' becomes null. Returns UTF-8 bytes.
+    """
+    members = []
+    for key, value in fields.items():
+        if isinstance(value, RawJSON):
+            encoded = value.text or 'null'
+        else:
+            encoded = json.dumps(value)
+        members.append(f"{json.dumps(key)}: {encoded}")
+    return ('{' + ', '.join(members) + '}').encode('utf-8')
+
+def row_etag(kind, row_id, date_created, variant=''):
+    """Strong ETag for an immutable row: its identity, creation time and response format."""
+    return f"{kind}-{row_id}-{int(date_created.timestamp() * 1000000)}-v{RESPONSE_FORMAT_VERSION}{variant}"
+
+def compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=9)
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=9)
+    return body
+
+def choose_encoding(accept_encodings):
+    """Pick br, then gzip, from the request's Accept-Encoding, or None for identity."""
+    if brotli is not None and accept_encodings['br']:
+        return 'br'
+    if accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+def json_response(body, etag, encoding=None):
+    """A JSON response for a (possibly precompressed) body with revalidation headers."""
+    response = Response(body, mimetype='application/json')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.set_etag(etag)
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def not_modified(etag):
+    response = Response(status=304)
+    response.set_etag(etag)
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
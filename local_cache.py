@@ -0,0 +1,131 @@
+# local_cache.py
+import os
+import sqlite3
+import threading
+import time
+import zlib
+import logging
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "instance/cache.db")
+
+class SQLiteCache:
+    """
+    Small persistent key/value cache stored in a SQLite table.
+    Values are text, stored zlib-compressed. Entries expire after `ttl` seconds and
+    the least recently used ones are evicted once `max_entries` is exceeded.
+    Each cache gets its own table, so several caches can share one database file.
+    """
+
+    def __init__(self, name, path=DEFAULT_CACHE_PATH, ttl=None, max_entries=None):
+        self.name = name
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._create_table()
+
+    def _connect(self):
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def _create_table(self):
+        conn = self._connect()
+        with conn:
+            conn.execute(f'''CREATE TABLE IF NOT EXISTS {self.name} (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )''')
+            conn.execute(f'CREATE INDEX IF NOT EXISTS ix_{self.name}_accessed_at ON {self.name} (accessed_at)')
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key):
+        """Return the cached text for key, or None on a miss or expired entry."""
+        try:
+            conn = self._connect()
+            row = conn.execute(f'SELECT value, created_at FROM {self.name} WHERE key = ?', (key,)).fetchone()
+            now = time.time()
+
+            if row is None:
+                self._count(False)
+                return None
+
+            if self.ttl is not None and now - row[1] > self.ttl:
+                with conn:
+                    conn.execute(f'DELETE FROM {self.name} WHERE key = ?', (key,))
+                self._count(False)
+                return None
+
+            with conn:
+                conn.execute(f'UPDATE {self.name} SET accessed_at = ? WHERE key = ?', (now, key))
+            self._count(True)
+            return zlib.decompress(row[0]).decode('utf-8')
+
+        except Exception as e:
+            logging.warning(f"{self.name} cache read failed for {key}: {str(e)}")
+            self._count(False)
+            return None
+
+    def set(self, key, value):
+        """Store text under key, then evict expired and least recently used entries."""
+        try:
+            conn = self._connect()
+            blob = zlib.compress(value.encode('utf-8'))
+            now = time.time()
+
+            with conn:
+                conn.execute(
+                    f'INSERT OR REPLACE INTO {self.name} (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)',
+                    (key, blob, len(blob), now, now)
+                )
+                self._evict(conn, now)
+
+        except Exception as e:
+            logging.warning(f"{self.name} cache write failed for {key}: {str(e)}")
+
+    def _evict(self, conn, now):
+        if self.ttl is not None:
+            conn.execute(f'DELETE FROM {self.name} WHERE created_at < ?', (now - self.ttl,))
+
+        if self.max_entries is not None:
+            conn.execute(
+                f'''DELETE FROM {self.name} WHERE key IN (
+                    SELECT key FROM {self.name} ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )''',
+                (self.max_entries,)
+            )
+
+    def delete(self, key):
+        conn = self._connect()
+        with conn:
+            conn.execute(f'DELETE FROM {self.name} WHERE key = ?', (key,))
+
+    def stats(self):
+        """Hit/miss counters for this process plus the current size of the table."""
+        conn = self._connect()
+        entries, total_bytes = conn.execute(f'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.name}').fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': entries,
+            'bytes': total_bytes
+        }
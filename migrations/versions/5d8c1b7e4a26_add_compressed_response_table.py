@@ -0,0 +1,34 @@
+"""Add compressed response table
+
+Revision ID: 5d8c1b7e4a26
+Revises: e3f07a5c2d19
+Create Date: 2026-10-18 14:21:08.337604
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d8c1b7e4a26'
+down_revision = 'e3f07a5c2d19'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('compressed_response',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=20), nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('encoding', sa.String(length=10), nullable=False),
+    sa.Column('etag', sa.String(length=100), nullable=False),
+    sa.Column('body', sa.LargeBinary(), nullable=False),
+    sa.Column('date_created', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('kind', 'item_id', 'encoding', name='uq_compressed_response')
+    )
+
+
+def downgrade():
+    op.drop_table('compressed_response')
@@ -0,0 +1,36 @@
+"""Add report job table
+
+Revision ID: 7c2e9a41d5b3
+Revises: 4818ea06ec5c
+Create Date: 2026-10-18 09:12:41.302118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c2e9a41d5b3'
+down_revision = '4818ea06ec5c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('report_job',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('url', sa.String(length=500), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('events', sa.Text(), nullable=False),
+    sa.Column('redirect_url', sa.String(length=200), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('date_created', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('date_updated', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('report_job')
@@ -0,0 +1,96 @@
+"""Add listing columns to channel_report and video_summary
+
+Revision ID: 9b41d6c2f8a7
+Revises: 7c2e9a41d5b3
+Create Date: 2026-10-18 11:40:17.518230
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b41d6c2f8a7'
+down_revision = '7c2e9a41d5b3'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 100
+
+channel_report = sa.table('channel_report',
+    sa.column('id', sa.Integer),
+    sa.column('raw_channel_data', sa.Text),
+    sa.column('avatar_url', sa.String),
+    sa.column('banner_url', sa.String),
+    sa.column('subscriber_count', sa.BigInteger),
+    sa.column('video_count', sa.Integer)
+)
+
+video_summary = sa.table('video_summary',
+    sa.column('id', sa.Integer),
+    sa.column('raw_video_data', sa.Text),
+    sa.column('thumbnail_url', sa.String),
+    sa.column('view_count', sa.BigInteger)
+)
+
+
+def to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def backfill(bind, table, raw_column, listing):
+    """Parse each row's raw JSON once, in id order and batches, and store its listing fields."""
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(table.c.id, table.c[raw_column])
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            return
+
+        for row_id, raw in rows:
+            try:
+                data = json.loads(raw) if raw else {}
+            except ValueError:
+                data = {}
+            bind.execute(table.update().where(table.c.id == row_id).values(**listing(data)))
+
+        last_id = rows[-1][0]
+
+
+def upgrade():
+    op.add_column('channel_report', sa.Column('avatar_url', sa.String(length=500), nullable=True))
+    op.add_column('channel_report', sa.Column('banner_url', sa.String(length=500), nullable=True))
+    op.add_column('channel_report', sa.Column('subscriber_count', sa.BigInteger(), nullable=True))
+    op.add_column('channel_report', sa.Column('video_count', sa.Integer(), nullable=True))
+    op.add_column('video_summary', sa.Column('thumbnail_url', sa.String(length=500), nullable=True))
+    op.add_column('video_summary', sa.Column('view_count', sa.BigInteger(), nullable=True))
+
+    bind = op.get_bind()
+    backfill(bind, channel_report, 'raw_channel_data', lambda data: {
+        'avatar_url': data.get('avatar_url'),
+        'banner_url': data.get('banner_url'),
+        'subscriber_count': to_int(data.get('subscriber_count')),
+        'video_count': to_int(data.get('total_video_count'))
+    })
+    backfill(bind, video_summary, 'raw_video_data', lambda data: {
+        'thumbnail_url': data.get('thumbnail_url'),
+        'view_count': to_int(data.get('views'))
+    })
+
+
+def downgrade():
+    op.drop_column('video_summary', 'view_count')
+    op.drop_column('video_summary', 'thumbnail_url')
+    op.drop_column('channel_report', 'video_count')
+    op.drop_column('channel_report', 'subscriber_count')
+    op.drop_column('channel_report', 'banner_url')
+    op.drop_column('channel_report', 'avatar_url')
@@ -0,0 +1,95 @@
+"""Add header_data to channel_report and video_summary
+
+Revision ID: a6e2d94f1c38
+Revises: 5d8c1b7e4a26
+Create Date: 2026-10-18 15:02:44.306718
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6e2d94f1c38'
+down_revision = '5d8c1b7e4a26'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 100
+
+# Copies of app.CHANNEL_HEADER_FIELDS / VIDEO_HEADER_FIELDS as of this revision
+CHANNEL_HEADER_FIELDS = ('title', 'avatar_url', 'banner_url', 'subscriber_count', 'total_video_count', 'trailer_video_id')
+VIDEO_HEADER_FIELDS = ('title', 'youtube_video_id', 'thumbnail_url', 'views', 'like_count', 'comment_count', 'date_published', 'channel_title')
+
+channel_report = sa.table('channel_report',
+    sa.column('id', sa.Integer),
+    sa.column('raw_channel_data', sa.Text),
+    sa.column('header_data', sa.Text)
+)
+
+video_summary = sa.table('video_summary',
+    sa.column('id', sa.Integer),
+    sa.column('raw_video_data', sa.Text),
+    sa.column('header_data', sa.Text)
+)
+
+compressed_response = sa.table('compressed_response',
+    sa.column('kind', sa.String)
+)
+
+
+def channel_header(data):
+    header = {key: data.get(key) for key in CHANNEL_HEADER_FIELDS}
+    videos = data.get('videos') or []
+    header['videos'] = [
+        {key: video.get(key) for key in ('youtube_video_id', 'title', 'views')}
+        for video in sorted(videos, key=lambda video: video.get('views') or 0, reverse=True)[:1]
+    ]
+    return header
+
+
+def video_header(data):
+    return {key: data.get(key) for key in VIDEO_HEADER_FIELDS}
+
+
+def backfill(bind, table, raw_column, header):
+    """Parse each row's raw JSON once, in id order and batches, and store its header JSON."""
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(table.c.id, table.c[raw_column])
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            return
+
+        for row_id, raw in rows:
+            try:
+                data = json.loads(raw) if raw else None
+            except ValueError:
+                data = None
+            if data:
+                bind.execute(table.update().where(table.c.id == row_id).values(header_data=json.dumps(header(data))))
+
+        last_id = rows[-1][0]
+
+
+def upgrade():
+    op.add_column('channel_report', sa.Column('header_data', sa.Text(), nullable=True))
+    op.add_column('video_summary', sa.Column('header_data', sa.Text(), nullable=True))
+
+    bind = op.get_bind()
+    backfill(bind, channel_report, 'raw_channel_data', channel_header)
+    backfill(bind, video_summary, 'raw_video_data', video_header)
+
+    # Responses are now stored per view ('report.full', ...); the unversioned ones are unreachable
+    bind.execute(compressed_response.delete().where(compressed_response.c.kind.in_(['report', 'summary'])))
+
+
+def downgrade():
+    op.drop_column('video_summary', 'header_data')
+    op.drop_column('channel_report', 'header_data')
@@ -0,0 +1,34 @@
+"""Add rendered export table
+
+Revision ID: c47b1e8d2f90
+Revises: a6e2d94f1c38
+Create Date: 2026-10-18 16:10:52.914027
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c47b1e8d2f90'
+down_revision = 'a6e2d94f1c38'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('rendered_export',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=20), nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('format', sa.String(length=10), nullable=False),
+    sa.Column('etag', sa.String(length=100), nullable=False),
+    sa.Column('body', sa.LargeBinary(), nullable=False),
+    sa.Column('date_created', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('kind', 'item_id', 'format', name='uq_rendered_export')
+    )
+
+
+def downgrade():
+    op.drop_table('rendered_export')
\ No newline at end of file
@@ -0,0 +1,26 @@
+"""Add (user_id, date_accessed) indexes to the access tables
+
+Revision ID: e3f07a5c2d19
+Revises: 9b41d6c2f8a7
+Create Date: 2026-10-18 13:05:52.904716
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3f07a5c2d19'
+down_revision = '9b41d6c2f8a7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_user_report_access_user_date', 'user_report_access', ['user_id', 'date_accessed'], unique=False)
+    op.create_index('ix_user_video_access_user_date', 'user_video_access', ['user_id', 'date_accessed'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_user_video_access_user_date', table_name='user_video_access')
+    op.drop_index('ix_user_report_access_user_date', table_name='user_report_access')
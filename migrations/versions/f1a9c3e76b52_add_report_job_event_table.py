@@ -0,0 +1,75 @@
+"""Store report job events as rows instead of a JSON column
+
+Revision ID: f1a9c3e76b52
+Revises: c47b1e8d2f90
+Create Date: 2026-10-18 17:05:31.448102
+
+"""
+import json
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1a9c3e76b52'
+down_revision = 'c47b1e8d2f90'
+branch_labels = None
+depends_on = None
+
+report_job = sa.table('report_job',
+    sa.column('id', sa.String),
+    sa.column('events', sa.Text)
+)
+
+report_job_event = sa.table('report_job_event',
+    sa.column('job_id', sa.String),
+    sa.column('seq', sa.Integer),
+    sa.column('data', sa.Text),
+    sa.column('date_created', sa.DateTime(timezone=True))
+)
+
+
+def upgrade():
+    op.create_table('report_job_event',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('job_id', sa.String(length=36), nullable=False),
+    sa.Column('seq', sa.Integer(), nullable=False),
+    sa.Column('data', sa.Text(), nullable=False),
+    sa.Column('date_created', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['job_id'], ['report_job.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('job_id', 'seq', name='uq_report_job_event_seq')
+    )
+
+    bind = op.get_bind()
+    now = datetime.now(timezone.utc)
+    for job_id, events_json in bind.execute(sa.select(report_job.c.id, report_job.c.events)).fetchall():
+        rows = [
+            {'job_id': job_id, 'seq': seq, 'data': json.dumps(event), 'date_created': now}
+            for seq, event in enumerate(json.loads(events_json or '[]'))
+        ]
+        if rows:
+            bind.execute(report_job_event.insert(), rows)
+
+    with op.batch_alter_table('report_job') as batch_op:
+        batch_op.drop_column('events')
+
+
+def downgrade():
+    with op.batch_alter_table('report_job') as batch_op:
+        batch_op.add_column(sa.Column('events', sa.Text(), nullable=False, server_default='[]'))
+
+    bind = op.get_bind()
+    events_by_job = {}
+    rows = bind.execute(
+        sa.select(report_job_event.c.job_id, report_job_event.c.data)
+        .order_by(report_job_event.c.job_id, report_job_event.c.seq)
+    ).fetchall()
+    for job_id, data in rows:
+        events_by_job.setdefault(job_id, []).append(json.loads(data))
+    for job_id, events in events_by_job.items():
+        bind.execute(report_job.update().where(report_job.c.id == job_id).values(events=json.dumps(events)))
+
+    op.drop_table('report_job_event')
\ No newline at end of file
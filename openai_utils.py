@@ -2,15 +2,134 @@ from openai import OpenAI
 import json
 from config import Config
 import os
+from prompt_encoding import encode_channel_data
+from local_cache import SQLiteCache
+from token_budget import count_tokens, split_into_chunks, select_windows
+import logging
+import hashlib
+import debug_artifacts
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Use configuration values
 API_KEY = Config.YOUTUBE_API_KEY # os.environ.get('YOUTUBE_API_KEY')
 OPENAI_API_KEY = Config.OPENAI_API_KEY # os.environ.get('OPENAI_API_KEY')
 OPENAI_MODEL = Config.OPENAI_MODEL # app_config['openai_model']
 MAX_TOKENS = Config.MAX_TOKENS # app_config['max_tokens']
+REPORT_GENERATION_MODE = Config.REPORT_GENERATION_MODE
+REPORT_SECTION_WORKERS = Config.REPORT_SECTION_WORKERS
+REPORT_SECTION_MAX_TOKENS = 2500
+SUMMARY_CHUNK_THRESHOLD = Config.SUMMARY_CHUNK_THRESHOLD
+SUMMARY_CHUNK_TOKENS = Config.SUMMARY_CHUNK_TOKENS
+SUMMARY_MAP_WORKERS = Config.SUMMARY_MAP_WORKERS
+CHUNK_NOTES_MAX_TOKENS = 800
 
 client = OpenAI(api_key=OPENAI_API_KEY)
 
+# Completed responses keyed by a hash of the request, so an identical request
+# (a retry, a regenerated report) is answered without calling the API
+completion_cache = SQLiteCache(
+    'completions',
+    ttl=Config.COMPLETION_CACHE_TTL,
+    max_entries=Config.COMPLETION_CACHE_MAX_ENTRIES
+)
+
+def completion_cache_key(kwargs):
+    """SHA-256 of the request parameters (model, messages, response_format, max_tokens, ...)."""
+    canonical = json.dumps(kwargs, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+class CompletionUsage:
+    """Running OpenAI token totals, to measure how much of each prompt the provider cache serves."""
+
+    def __init__(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.completion_tokens = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, usage, seconds):
+        """Add one response's usage (prompt_tokens_details.cached_tokens included) and latency."""
+        details = getattr(usage, 'prompt_tokens_details', None)
+        cached_tokens = (getattr(details, 'cached_tokens', None) or 0) if details else 0
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += usage.prompt_tokens
+            self.cached_tokens += cached_tokens
+            self.completion_tokens += usage.completion_tokens
+            self.seconds += seconds
+        return cached_tokens
+
+    def summary(self):
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'prompt_tokens': self.prompt_tokens,
+                'cached_tokens': self.cached_tokens,
+                'cached_ratio': self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0,
+                'completion_tokens': self.completion_tokens,
+                'average_seconds': self.seconds / self.calls if self.calls else 0.0
+            }
+
+completion_usage = CompletionUsage()
+
+def record_completion_usage(model, usage, started):
+    """Log and total a response's token usage, including its prompt-cache hit."""
+    if usage is None:
+        return
+    seconds = time.monotonic() - started
+    cached_tokens = completion_usage.record(usage, seconds)
+    logging.info(
+        f"OpenAI {model}: {usage.prompt_tokens} prompt tokens ({cached_tokens} cached), "
+        f"{usage.completion_tokens} completion tokens in {seconds:.1f}s"
+    )
+
+def create_chat_completion(on_delta=None, **kwargs):
+    """
+    Call chat.completions.create and return the message content.
+    With on_delta, the response is streamed and each content fragment is passed
+    to on_delta(text) as it arrives. Responses that finish normally are cached;
+    a cached response is passed to on_delta in one piece.
+    """
+    key = completion_cache_key(kwargs)
+    cached = completion_cache.get(key)
+    if cached is not None:
+        logging.info(f"Completion cache hit for {kwargs.get('model')} request {key[:12]}")
+        if on_delta:
+            on_delta(cached)
+        return cached
+
+    started = time.monotonic()
+    if on_delta is None:
+        response = client.chat.completions.create(**kwargs)
+        content = response.choices[0].message.content
+        finish_reason = response.choices[0].finish_reason
+        record_completion_usage(kwargs.get('model'), response.usage, started)
+    else:
+        parts = []
+        finish_reason = None
+        # include_usage adds a final chunk, with no choices, carrying the token usage
+        for chunk in client.chat.completions.create(stream=True, stream_options={"include_usage": True}, **kwargs):
+            if getattr(chunk, 'usage', None):
+                record_completion_usage(kwargs.get('model'), chunk.usage, started)
+            if not chunk.choices:
+                continue
+            if chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+                on_delta(chunk.choices[0].delta.content)
+            if chunk.choices[0].finish_reason:
+                finish_reason = chunk.choices[0].finish_reason
+        content = ''.join(parts)
+
+    # Truncated ('length') or filtered responses are not worth replaying
+    if content and finish_reason == 'stop':
+        completion_cache.set(key, content)
+
+    return content
+
 def analyze_watch_history(history_data):
     """Analyze watch history data using OpenAI."""
     prompt = f"""You are a skilled psychologist analyzing a person's YouTube watch history. 
@@ -47,7 +166,7 @@ def analyze_watch_history(history_data):
     """
 
     try:
-        response = client.chat.completions.create(
+        return create_chat_completion(
             model=OPENAI_MODEL,
             response_format={ "type": "json_object" },
             messages=[
@@ -58,79 +177,62 @@ def analyze_watch_history(history_data):
             max_tokens=4000
         )
         
-        return response.choices[0].message.content
-        
     except Exception as e:
         logging.error(f"Error in analyze_watch_history: {str(e)}")
         return json.dumps({"error": str(e)})
 
-# report_data is a JSON formatted file containing channel data
-def generate_channel_report(channel_data):
-    # Load JSON report template
-    try:
-        with open('json_template_report_v2.json', 'r') as f:
-            json_template_report = json.load(f)
-    except Exception as e:
-        print(f"Error loading template: {e}")
-        return None
-
-    # Convert channel_data to JSON string if it's not already
-    if isinstance(channel_data, dict):
-        channel_data_str = json.dumps(channel_data, indent=2)
-    else:
-        channel_data_str = channel_data
-
-    ## To debug the channel data, un-comment this
-    # with open('channel_data_dump.json', 'w', encoding='utf-8') as f:
-    #     print(channel_data_str)
-    
-    # Craft the prompt
-    prompt = f"""
-    <instructions>
-        Role: You are a YouTube content consultant.
-        Objective:
-            - Analyse the YouTube channel data in <channel_data> and generate a concise report that prioritises actionable insight.
-            - Provide findings in bullet points rather than sentences, such as:
-                Point 1
-                Point 2
-                Point 3
+# Prompt fragments shared by the single-call and section-parallel channel reports
+REPORT_CLASSIFICATION_INSTRUCTIONS = '''\
             - Classify the content using the lists in <content_categories> and <video_formats>:
                 1. content_categories: Select up to three categories from <Content Categories> that best describe the channel, ordered by relevance.
                 2. video_formats: Identify the primary video format(s) from <Video Formats>. List up to three formats, in order of prevalence, if multiple are used frequently.
                 3. content_category_justification: Explain in 2–3 sentences why you chose these categories and formats, specifying which content elements informed your selection. 
-                Include this classification in the categorisation section of <return_json_template>.
+                Include this classification in the categorisation section of <return_json_template>.'''
+
+REPORT_STYLE_INSTRUCTIONS = '''\
         Tone: Write in a clear, structured, and concise style that appeals to YouTube content creators. Avoid passive phrasing. Be constructive yet direct, especially when identifying areas for improvement.
         Other Instructions:
             - Highlight specific strengths, weaknesses, and areas of improvement.
             - Support insights and recommendations with concrete data.
+            - Take averages, medians, engagement rates, upload frequency and trends from the stats in <channel_data> rather than recalculating them.
             - Provide thoughtful, concise answers, and avoid rushing to conclusions.
-            - Provide your answers in bullet points for each section of the report.
-        Report Structure: 
+            - Provide your answers in bullet points for each section of the report.'''
+
+REPORT_SECTION_INSTRUCTIONS = [
+'''\
             1. Executive Summary (At least 3 bullet points for each section)
                 1. Content summary: 3 bullet points that answer the following questions:
                     - What subject matter does this channel use in its content?
                     - What video formats does this channel use to deliver its content?
                     - What is the most noteable thing about this channel? If there is nothing noteable, point that out as a failing.
                 2. Channel hosts and personalities: Describe the hosts if they are mentioned in the data. If not, indicate this. Incorporate any relevant external knowledge.
-                3. Channel prominence and competitive landscape: Analyse the channel’s success or limitations in its niche.
+                3. Channel prominence and competitive landscape: Analyse the channel’s success or limitations in its niche.''',
+'''\
             2. Key Metrics (At least 3 bullet points for each section)
                 1. Viewership: List average and median views. Review view counts, likes, and comments for different video types, identifying successful formats or inconsistencies.
                 2. Top-performing content category and video format: Based on <Content Categories> and <Video Formats>, identify the best-performing category and format, using series or franchise names where applicable.
-                3. Publishing frequency: Note the channel’s average weekly uploads and compare with similar channels, listing the primary competitors.
+                3. Publishing frequency: Note the channel’s average weekly uploads and compare with similar channels, listing the primary competitors.''',
+'''\
             3. Trends (At least 3 bullet points for each section):
                 1. Recent trends: List 3 notable content trends evident in the <channel_data>, each with a short sentence of explanation.
                 2. Successful video formats: Explain what the channel's most successful video format is and why it's working for them.
-                3. Trajectory: Analyze whether the channel is growing or shrinking and give some reasoning as to why.
+                3. Trajectory: Analyze whether the channel is growing or shrinking and give some reasoning as to why.''',
+'''\
             4. Stylistic Choices (At least 3 bullet points for each section):
                 1. Oratory style: Using subtitle data, provide 3 bullet points of analysis of the channel’s oratory style. Include relevant quotes from subtitles (2–3 sentences each) to illustrate your points.
                 2. Titles: Using video title data, provide 3 bullet points of analysis of the channels approach to titling its videos.
-                3. Descriptions: Using description data, provide 3 bullet points of analysis of the channels approach to writing descriptions.
+                3. Descriptions: Using description data, provide 3 bullet points of analysis of the channels approach to writing descriptions.''',
+'''\
             5. Recommendations (At least 3 bullet points for each section):
-                - Offer three growth recommendations, with data-backed reasoning for each. Focus on strategies for rapid growth, either by refining the current approach or pivoting as needed. Reference strategies used by competitors where applicable.
+                - Offer three growth recommendations, with data-backed reasoning for each. Focus on strategies for rapid growth, either by refining the current approach or pivoting as needed. Reference strategies used by competitors where applicable.''',
+'''\
             6. Limitations:
-                - Highlight any data limitations you identify in <channel_data>.
-    </instructions>
-    
+                - Highlight any data limitations you identify in <channel_data>.'''
+]
+
+REPORT_STRUCTURE = '\n'.join(REPORT_SECTION_INSTRUCTIONS)
+
+REPORT_CLASSIFICATION_LISTS = '''\
     <content_categories>
         Entertainment
         Education
@@ -175,26 +277,207 @@ def generate_channel_report(channel_data):
         Explainer
         Product Demonstration
         Debate/Discussion
-    </video_formats>
+    </video_formats>'''
+
+# Static lead of every section prompt, byte-identical across calls and reports
+# so the provider's automatic prompt caching can reuse it
+REPORT_SECTION_SYSTEM_PROMPT = f"""You are a helpful YouTube content consultant who responds in JSON.
+    <instructions>
+        Role: You are a YouTube content consultant.
+        Objective:
+            - Analyse the YouTube channel data in <channel_data>. You will be asked to write one part of a concise report that prioritises actionable insight.
+            - Provide findings in bullet points rather than sentences, such as:
+                Point 1
+                Point 2
+                Point 3
+{REPORT_STYLE_INSTRUCTIONS}
+    </instructions>
+    
+{REPORT_CLASSIFICATION_LISTS}
+"""
+
+def generate_report_part(channel_block, instructions, template, on_delta=None):
+    """
+    Ask for one part of the report and return it parsed. The channel data comes
+    before the task, so the calls for one report also share it as a prefix.
+    on_delta, if given, receives the part's text as it is generated.
+    """
+    prompt = f"""{channel_block}
+    <task>
+        Write only this part of the report:
+{instructions}
+    </task>
+
+    Use this JSON template to format your results:
+
+    <return_json_template>
+        {json.dumps(template)}
+    </return_json_template>
+    """
+
+    returned_string = create_chat_completion(
+        on_delta=on_delta,
+        model=OPENAI_MODEL,
+        response_format={ "type": "json_object" },
+        messages=[
+            {"role": "system", "content": REPORT_SECTION_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ],
+        max_tokens=REPORT_SECTION_MAX_TOKENS
+    )
+    return json.loads(returned_string)
+
+def generate_channel_report_sections(channel_data_str, json_template_report, on_delta=None):
+    """
+    Generate the report as parallel completions, one for the title and
+    categorisation and one per report section, and merge them into the
+    json_template_report_v2 structure. Returns the report JSON string, or None
+    if any part fails.
+    The parts are streamed to on_delta as they are written. Their text shares
+    one stream, so whenever it switches to another part it is tagged first with
+    "[<part name>] ".
+    """
+    template = json_template_report['consultation_report']
+    channel_block = f"""
+    <channel_data>
+        {channel_data_str}
+    </channel_data>
+    """
+
+    debug_artifacts.record('report_prompt', REPORT_SECTION_SYSTEM_PROMPT + channel_block)
+
+    parts = [('categorisation', REPORT_CLASSIFICATION_INSTRUCTIONS + "\n                Also give the report a short title.",
+              {'title': template['title'], 'categorisation': template['categorisation']})]
+    for section, instructions in zip(template['sections'], REPORT_SECTION_INSTRUCTIONS):
+        parts.append((section['subtitle'], instructions, {'section': section}))
+
+    results = {}
+    relay_lock = threading.Lock()
+    relay_state = {'part': None}
+
+    def part_delta(name):
+        if on_delta is None:
+            return None
+
+        def relay(text):
+            # Parts stream on their own threads; the lock keeps on_delta calls and tags in order
+            with relay_lock:
+                if relay_state['part'] != name:
+                    on_delta(f"\n[{name}] ")
+                    relay_state['part'] = name
+                on_delta(text)
+
+        return relay
+
+    try:
+        with ThreadPoolExecutor(max_workers=REPORT_SECTION_WORKERS, thread_name_prefix='report-section') as executor:
+            futures = {
+                executor.submit(generate_report_part, channel_block, instructions, part_template, part_delta(name)): name
+                for name, instructions, part_template in parts
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+
+        head = results['categorisation']
+        categorisation = head.get('categorisation')
+        # Callers read categorisation[0] as a dict; fall back rather than store a report that breaks them
+        if not (isinstance(categorisation, list) and categorisation and all(isinstance(item, dict) for item in categorisation)):
+            logging.error(f"Report categorisation has the wrong shape: {categorisation!r}")
+            return None
+
+        sections = []
+        for section in template['sections']:
+            written = results[section['subtitle']].get('section', {})
+            # Keep numbering and headings exactly as the template has them
+            written['number'] = section['number']
+            written['subtitle'] = section['subtitle']
+            sections.append(written)
+
+        report = json.dumps({
+            'consultation_report': {
+                'title': head.get('title', ''),
+                'categorisation': categorisation,
+                'sections': sections
+            }
+        })
+
+        debug_artifacts.record('report_output', report)
+
+        return report
+
+    except Exception as e:
+        logging.error(f"Error generating report sections: {str(e)}")
+        return None
+
+# report_data is a JSON formatted file containing channel data
+# on_delta, if given, receives the report text incrementally as it is generated
+def generate_channel_report(channel_data, on_delta=None):
+    # Load JSON report template
+    try:
+        with open('json_template_report_v2.json', 'r') as f:
+            json_template_report = json.load(f)
+    except Exception as e:
+        print(f"Error loading template: {e}")
+        return None
+
+    # Encode channel_data compactly (tabular, trimmed fields) if it's not already a string
+    if isinstance(channel_data, dict):
+        channel_data_str = encode_channel_data(channel_data)
+    else:
+        channel_data_str = channel_data
+
+    if REPORT_GENERATION_MODE == 'sections':
+        report = generate_channel_report_sections(channel_data_str, json_template_report, on_delta)
+        if report:
+            return report
+        print("Section-parallel report failed, falling back to a single completion")
+        if on_delta:
+            # Parts may already have been streamed; mark where the whole report starts
+            on_delta("\n[Full report] ")
+
+    ## To debug the channel data, un-comment this
+    # with open('channel_data_dump.json', 'w', encoding='utf-8') as f:
+    #     print(channel_data_str)
+    
+    # Craft the prompt: static instructions and template as the system message,
+    # identical for every channel so it is served from the provider's prompt
+    # cache, then the channel data
+    system_prompt = f"""You are a helpful YouTube content consultant who responds in JSON.
+    <instructions>
+        Role: You are a YouTube content consultant.
+        Objective:
+            - Analyse the YouTube channel data in <channel_data> and generate a concise report that prioritises actionable insight.
+            - Provide findings in bullet points rather than sentences, such as:
+                Point 1
+                Point 2
+                Point 3
+{REPORT_CLASSIFICATION_INSTRUCTIONS}
+{REPORT_STYLE_INSTRUCTIONS}
+        Report Structure: 
+{REPORT_STRUCTURE}
+    </instructions>
+    
+{REPORT_CLASSIFICATION_LISTS}
 
     Use this JSON template to format your results:
 
     <return_json_template>
         {json_template_report}
     </return_json_template>
+    """
 
+    prompt = f"""
     <channel_data>
         {channel_data_str}
     </channel_data>
     """
 
-    with open('prompt.txt', 'w') as file:
-        file.write(prompt)
+    debug_artifacts.record('report_prompt', system_prompt + prompt)
 
-    prompt_chars = len(prompt)
-    est_tokens = prompt_chars/4
+    prompt_chars = len(system_prompt) + len(prompt)
+    prompt_tokens = count_tokens(system_prompt) + count_tokens(prompt)
 
-    print(f"Length of prompt: {prompt_chars} - Estimated token length: {est_tokens}")
+    print(f"Length of prompt: {prompt_chars} - Token length: {prompt_tokens}")
 
     # Interface with OpenAI - o1-mini
     '''try:
@@ -206,38 +489,99 @@ def generate_channel_report(channel_data):
         )'''
     
     try:
-        response = client.chat.completions.create(
+        returned_string = create_chat_completion(
+            on_delta=on_delta,
             model=OPENAI_MODEL,
             response_format={ "type": "json_object" },
             messages=[
-                {"role": "system", "content": "You are a helpful YouTube content consultant who responds in JSON."},
+                {"role": "system", "content": system_prompt},
                 {"role": "user", "content": prompt}
             ],
             max_tokens=10000
         )
 
-        returned_string = response.choices[0].message.content 
-        with open('output.txt', 'w') as file:
-            file.write(returned_string)
+        debug_artifacts.record('report_output', returned_string)
+
+        # Validate the complete response (a streamed one can end mid-object)
+        json.loads(returned_string)
         return returned_string
     except Exception as e:
         print(f"An error occurred while generating the report: {e}")
         return ""
 
+def summarize_transcript_chunk(chunk, part, parts, title):
+    """Map step: condense one part of a long transcript into dense notes."""
+    prompt = f"""
+    <instructions>
+        - Below is part {part} of {parts} of the transcript of the YouTube video "{title}".
+        - Write dense notes on this part: every distinct idea, claim, example, number and name, in the order they come up.
+        - Keep notable quotes word for word if they are at least 2-3 sentences long.
+        - Use plain text bullet points. Do not summarise the video as a whole or refer to other parts.
+    </instructions>
+    <transcript_part>
+    {chunk}
+    </transcript_part>
+    """
+
+    try:
+        return create_chat_completion(
+            model=OPENAI_MODEL,
+            messages=[
+                {"role": "system", "content": "You are an expert at taking notes."},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=CHUNK_NOTES_MAX_TOKENS
+        )
+    except Exception as e:
+        # Keep the part represented with excerpts rather than dropping it from the summary
+        logging.error(f"Error summarising transcript part {part}/{parts} of {title}: {str(e)}")
+        return select_windows(chunk, CHUNK_NOTES_MAX_TOKENS)
+
+def condense_long_transcript(video_data):
+    """
+    Return video_data unchanged if its transcript fits in one summary call.
+    Otherwise split the transcript into SUMMARY_CHUNK_TOKENS chunks, summarise
+    them in parallel (up to SUMMARY_MAP_WORKERS at a time) and return a copy with
+    the subtitles replaced by 'transcript_notes', one entry per part in order.
+    """
+    subtitles = video_data.get('subtitles') or ''
+    if count_tokens(subtitles) <= SUMMARY_CHUNK_THRESHOLD:
+        return video_data
+
+    chunks = split_into_chunks(subtitles, SUMMARY_CHUNK_TOKENS)
+    title = video_data.get('title', '')
+    logging.info(f"Summarising transcript of {title} in {len(chunks)} parts")
+
+    with ThreadPoolExecutor(max_workers=SUMMARY_MAP_WORKERS, thread_name_prefix='summary-map') as executor:
+        notes = list(executor.map(
+            lambda numbered: summarize_transcript_chunk(numbered[1], numbered[0], len(chunks), title),
+            enumerate(chunks, 1)
+        ))
+
+    condensed = {key: value for key, value in video_data.items() if key != 'subtitles'}
+    condensed['transcript_notes'] = [f"Part {part}/{len(notes)}: {text}" for part, text in enumerate(notes, 1)]
+    return condensed
+
 # report_data is a JSON formatted file containing channel data
-def generate_video_summary(video_data):
+# on_delta, if given, receives the summary text incrementally as it is generated
+# Long transcripts are first condensed part by part (map) before the summary call (reduce)
+def generate_video_summary(video_data, on_delta=None):
+    
+    video_data = condense_long_transcript(video_data)
     
     # Load JSON summary template
     with open('json_template_summary.json') as f:
         json_template_summary = json.load(f)
 
-    # Prompt
-    prompt = f"""
+    # Prompt: static instructions and template as the system message, identical
+    # for every video so it is served from the provider's prompt cache, then the video data
+    system_prompt = f"""You are an expert at taking notes.
     <role>
         - You are an expert at taking notes.
     </role>
     <instructions>
         - **Generate a set of concise, structured notes** from the content in <video_data> below 
+        - For long videos <video_data> holds transcript_notes instead of subtitles: notes on consecutive parts of the transcript, in order. Treat them together as the video's content.
         - **Focus directly on the core insights** from the video. 
         - Use **active voice** to state these insights clearly. Avoid passive constructions (e.g., "it explores," "the video discusses") and unnecessary detachment. 
         - Eliminate any extraneous or filler language. Only include the **most critical points** that help to explain the core ideas. 
@@ -257,6 +601,9 @@ def generate_video_summary(video_data):
             {json_template_summary}
         </results_format>
     </instructions>
+    """
+
+    prompt = f"""
     <video_data>
     {json.dumps(video_data, indent=2)}
     </video_data>
@@ -264,17 +611,16 @@ def generate_video_summary(video_data):
 
     # Interface with OpenAI
     try:
-        response = client.chat.completions.create(
+        summary = create_chat_completion(
+            on_delta=on_delta,
             model=OPENAI_MODEL,
             response_format={ "type": "json_object" },
             messages=[
-                {"role": "system", "content": "You are an expert at taking notes."},
+                {"role": "system", "content": system_prompt},
                 {"role": "user", "content": prompt}
             ],
             max_tokens=4000
         )
-
-        summary = response.choices[0].message.content
         # Ensure the summary is valid JSON
         # json.loads(summary)  # This will raise an exception if the summary is not valid JSON
         json_data = json.loads(summary)
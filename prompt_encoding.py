@@ -0,0 +1,111 @@
+# prompt_encoding.py
+import re
+from channel_metrics import compute_channel_metrics
+
+# Per-field character budgets applied before data goes into a prompt.
+# Subtitles are budgeted in tokens upstream (token_budget.budget_transcripts).
+FIELD_CHAR_BUDGETS = {
+    'channel_description': 1000,
+    'title': 150,
+    'description': 300,
+    'tags': 120
+}
+
+# Video columns the report prompt draws on, in table order.
+# IDs, thumbnail URLs, category IDs and the repeated channel title are dropped.
+VIDEO_COLUMNS = [
+    ('date', 'date_published'),
+    ('title', 'title'),
+    ('views', 'views'),
+    ('likes', 'like_count'),
+    ('comments', 'comment_count'),
+    ('length_s', 'length'),
+    ('tags', 'tags'),
+    ('description', 'description')
+]
+
+# Used in place of the raw counts when there are stats: the stats block carries
+# the absolute figures and each row only its relative performance
+VIDEO_COLUMNS_WITH_STATS = [
+    ('date', 'date_published'),
+    ('title', 'title'),
+    ('views_x_median', 'views_vs_median'),
+    ('engagement_pct', 'engagement_rate'),
+    ('outlier', 'view_outlier'),
+    ('length_s', 'length'),
+    ('tags', 'tags'),
+    ('description', 'description')
+]
+
+def truncate(text, budget):
+    """Collapse whitespace and cut text to at most `budget` characters."""
+    text = re.sub(r'\s+', ' ', '' if text is None else str(text)).strip()
+    if budget is not None and len(text) > budget:
+        return text[:budget - 1].rstrip() + '…'
+    return text
+
+def table_cell(value, budget=None):
+    if isinstance(value, list):
+        value = ', '.join(str(item) for item in value)
+    return truncate(value, budget).replace('|', '/')
+
+def encode_stats(stats, prefix=''):
+    """Flatten the stats block into key: value lines, nested keys joined with '.'."""
+    lines = []
+    for key, value in stats.items():
+        if isinstance(value, dict):
+            lines.extend(encode_stats(value, f"{prefix}{key}."))
+        elif value is not None:
+            lines.append(f"{prefix}{key}: {value}")
+    return lines
+
+def encode_channel_data(channel_data):
+    """
+    Render channel_data as a compact text block for the report prompt.
+    Channel fields and the stats computed over the videos (channel_metrics)
+    become key: value lines, the videos one pipe-separated table with a single
+    header row (newest first), and subtitles separate blocks that reference the
+    table's row numbers. The stats exist only in the prompt; channel_data is
+    not modified.
+    """
+    lines = [
+        f"channel: {truncate(channel_data.get('title'), FIELD_CHAR_BUDGETS['title'])}",
+        f"launch_date: {str(channel_data.get('launch_date', ''))[:10]}",
+        f"subscribers: {channel_data.get('subscriber_count', '')}",
+        f"total_views: {channel_data.get('total_view_count', '')}",
+        f"total_videos: {channel_data.get('total_video_count', '')}",
+        f"description: {truncate(channel_data.get('description'), FIELD_CHAR_BUDGETS['channel_description'])}"
+    ]
+
+    videos = channel_data.get('videos', [])
+    stats, video_metrics = compute_channel_metrics(videos)
+    columns = VIDEO_COLUMNS_WITH_STATS if stats else VIDEO_COLUMNS
+    if stats:
+        lines.append('')
+        lines.append("stats (precomputed over the videos below):")
+        lines.extend(encode_stats(stats))
+
+    lines.append('')
+    lines.append(f"videos ({len(videos)}, newest first):")
+    lines.append('|'.join(['#'] + [name for name, _ in columns]))
+
+    for number, video in enumerate(videos, 1):
+        row = {**video, **video_metrics[number - 1]} if video_metrics else video
+        cells = [str(number)]
+        for name, key in columns:
+            value = row.get(key, '')
+            if name == 'date':
+                value = str(value)[:10]
+            elif name == 'engagement_pct' and value != '':
+                value = round(100 * value, 2)
+            cells.append(table_cell(value, FIELD_CHAR_BUDGETS.get(name)))
+        lines.append('|'.join(cells))
+
+    subtitled = [(number, video) for number, video in enumerate(videos, 1) if video.get('subtitles')]
+    if subtitled:
+        lines.append('')
+        lines.append("subtitles (by video #):")
+        for number, video in subtitled:
+            lines.append(f"[{number}] {truncate(video['subtitles'], None)}")
+
+    return '\n'.join(lines)
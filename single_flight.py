@@ -0,0 +1,123 @@
+# single_flight.py
+import logging
+import threading
+
+class _Call:
+    def __init__(self):
+        self.events = []
+        self.listeners = []
+        self.followers = []
+        self.result = None
+        self.error = None
+        self.finished = False
+        self.done = threading.Event()
+        self.lock = threading.Lock()
+
+    def attach(self, listener, on_done=None):
+        """
+        Add a listener and replay the events it missed. Replay and live delivery
+        both happen under the lock, so the listener sees every event once, in order.
+        on_done is added to the followers unless the call has already finished;
+        returns False in that case.
+        """
+        with self.lock:
+            for event in self.events:
+                listener(event)
+            self.listeners.append(listener)
+            if on_done is None or self.finished:
+                return False
+            self.followers.append(on_done)
+            return True
+
+    def finish(self):
+        """Mark the call finished and return the followers to notify."""
+        with self.lock:
+            self.finished = True
+            return list(self.followers)
+
+    def emit(self, event):
+        with self.lock:
+            self.events.append(event)
+            for listener in self.listeners:
+                listener(event)
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key (e.g. a channel or video ID).
+    The first caller runs the function; callers arriving while it is in flight
+    attach to it, receive its progress events (including the ones already sent)
+    and share its result or exception instead of repeating the work.
+    Listeners are called with the call's lock held, so they must not call back
+    into the SingleFlight.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, on_event=None):
+        """
+        Run fn(emit) once per in-flight key. emit(event) forwards progress to every
+        attached caller's on_event. Returns (result, shared), where shared is True
+        for callers that attached to another caller's computation (and blocked
+        until it finished).
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if on_event:
+            call.attach(on_event)
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn(call.emit)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            followers = call.finish()
+            call.done.set()
+            self._notify_followers(key, call, followers)
+
+        return call.result, False
+
+    def follow(self, key, on_event, on_done):
+        """
+        Attach to the computation in flight for key without waiting for it:
+        on_event gets its progress, and on_done(result, error) is called on the
+        leader's thread once it finishes (or on this thread, if it finishes while
+        attaching). Returns False (and does nothing) if no computation is in
+        flight for key.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+        if call is None:
+            return False
+
+        # The replay runs on_event for every past event, so it happens under the call's lock only
+        if not call.attach(on_event, on_done):
+            # The leader finished since the lookup and has already notified its followers
+            self._notify_followers(key, call, [on_done])
+        return True
+
+    def _notify_followers(self, key, call, followers):
+        for on_done in followers:
+            try:
+                on_done(call.result, call.error)
+            except Exception as e:
+                logging.error(f"Follower of {key} failed: {str(e)}", exc_info=True)
+
+    def in_flight(self, key):
+        with self._lock:
+            return key in self._calls
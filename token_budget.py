@@ -0,0 +1,127 @@
+# token_budget.py
+import math
+import logging
+import threading
+from config import Config
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Fallback when tiktoken isn't installed: OpenAI's rule of thumb for English text
+CHARS_PER_TOKEN = 4.0
+
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+def get_encoding():
+    """The tokenizer for the configured model, or None to use the estimator."""
+    global _encoding, _encoding_loaded
+    with _encoding_lock:
+        if not _encoding_loaded:
+            # Load (or give up) once; a missing tokenizer is logged once, not on every count
+            _encoding_loaded = True
+            if tiktoken is None:
+                logging.warning(f"tiktoken is not installed; estimating token counts at {CHARS_PER_TOKEN} characters per token")
+            else:
+                try:
+                    _encoding = tiktoken.encoding_for_model(Config.OPENAI_MODEL)
+                except KeyError:
+                    _encoding = tiktoken.get_encoding('o200k_base')
+                except Exception as e:
+                    logging.warning(f"Could not load tokenizer, estimating token counts instead: {str(e)}")
+        return _encoding
+
+def count_tokens(text):
+    """Number of tokens in text, counted exactly with tiktoken when available."""
+    if not text:
+        return 0
+    encoding = get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+def allocate_budget(sizes, total_budget):
+    """
+    Split total_budget tokens across items needing `sizes` tokens each.
+    Items smaller than an even share keep their full size and the unused part is
+    shared among the rest, so no budget is left idle while anything is cut.
+    """
+    allocation = [0] * len(sizes)
+    remaining = total_budget
+    pending = sorted(range(len(sizes)), key=lambda i: sizes[i])
+
+    while pending:
+        share = remaining // len(pending)
+        index = pending[0]
+        if sizes[index] <= share:
+            allocation[index] = sizes[index]
+            remaining -= sizes[index]
+            pending.pop(0)
+        else:
+            for index in pending:
+                allocation[index] = share
+            break
+
+    return allocation
+
+def select_windows(text, token_budget, window_tokens=Config.TRANSCRIPT_WINDOW_TOKENS, separator=' … '):
+    """
+    Cut text down to about token_budget tokens by keeping evenly spaced windows
+    of ~window_tokens each, from the start through to the end, instead of only
+    the opening. Windows are aligned to word boundaries and joined with separator.
+    """
+    total_tokens = count_tokens(text)
+    if total_tokens <= token_budget:
+        return text
+    if token_budget <= 0:
+        return ''
+
+    words = text.split()
+    tokens_per_word = total_tokens / len(words)
+    budget_words = max(1, int(token_budget / tokens_per_word))
+    window_words = max(1, int(window_tokens / tokens_per_word))
+
+    window_count = max(1, budget_words // window_words)
+    window_words = budget_words // window_count
+    stride = (len(words) - window_words) / max(1, window_count - 1)
+
+    windows = []
+    for n in range(window_count):
+        start = int(round(n * stride)) if window_count > 1 else 0
+        windows.append(' '.join(words[start:start + window_words]))
+
+    return separator.join(windows)
+
+def split_into_chunks(text, chunk_tokens):
+    """
+    Split text into consecutive chunks of at most ~chunk_tokens tokens each,
+    on word boundaries and of roughly equal size.
+    """
+    total_tokens = count_tokens(text)
+    if total_tokens <= chunk_tokens:
+        return [text]
+
+    words = text.split()
+    chunk_count = math.ceil(total_tokens / chunk_tokens)
+    chunk_words = math.ceil(len(words) / chunk_count)
+    return [' '.join(words[start:start + chunk_words]) for start in range(0, len(words), chunk_words)]
+
+def budget_transcripts(videos, total_budget=Config.TRANSCRIPT_TOKEN_BUDGET):
+    """
+    Fit the 'subtitles' of videos into total_budget tokens, in place.
+    The budget is split across the videos that have subtitles and each
+    transcript is reduced to evenly spaced windows covering the whole video.
+    """
+    subtitled = [video for video in videos if video.get('subtitles')]
+    sizes = [count_tokens(video['subtitles']) for video in subtitled]
+    allocation = allocate_budget(sizes, total_budget)
+
+    for video, size, budget in zip(subtitled, sizes, allocation):
+        if size > budget:
+            video['subtitles'] = select_windows(video['subtitles'], budget)
+
+    logging.info(f"Transcript tokens: {sum(sizes)} fetched, {sum(allocation)} kept of a {total_budget} budget")
+    return videos
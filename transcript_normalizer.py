@@ -0,0 +1,68 @@
+# transcript_normalizer.py
+import re
+
+# Bump when normalization changes what a cleaned transcript looks like; it is
+# part of the transcript cache key, so transcripts cleaned the old way are refetched
+NORMALIZER_VERSION = 1
+
+# Overlaps shorter than this are kept, so a genuinely repeated word ("no no")
+# at a cue boundary is not mistaken for a rolling caption.
+MIN_OVERLAP_WORDS = 2
+
+def normalize_word(word):
+    """Comparison key for a word: lowercase with surrounding punctuation removed."""
+    return re.sub(r'^\W+|\W+$', '', word.lower()) or word
+
+def longest_overlap(tail, cue):
+    """
+    Length of the longest prefix of `cue` that is also a suffix of `tail`
+    (both lists of comparison keys). Uses the KMP failure function over
+    cue + [separator] + tail, so it runs in O(len(cue) + len(tail)).
+    """
+    if not tail or not cue:
+        return 0
+
+    sequence = cue + [None] + tail
+    failure = [0] * len(sequence)
+    for i in range(1, len(sequence)):
+        k = failure[i - 1]
+        while k > 0 and sequence[i] != sequence[k]:
+            k = failure[k - 1]
+        if sequence[i] == sequence[k]:
+            k += 1
+        failure[i] = k
+
+    return failure[-1]
+
+def dedupe_rolling_cues(segments, min_overlap=MIN_OVERLAP_WORDS):
+    """
+    Join caption cues into one transcript, dropping the words each cue repeats
+    from the end of the text before it. YouTube auto-captions roll: every cue
+    restates part (or all) of the previous one, which otherwise shows up as the
+    same phrase two or three times in a row.
+
+    Args:
+        segments (list[str]): Caption cue texts in playback order
+        min_overlap (int): Smallest overlap, in words, that is treated as repetition
+
+    Returns:
+        str: The cues joined with single spaces, without the rolling overlap
+    """
+    words = []
+    keys = []
+
+    for segment in segments:
+        cue = segment.split()
+        if not cue:
+            continue
+        cue_keys = [normalize_word(word) for word in cue]
+
+        # Only the last len(cue) words of the transcript can overlap the cue
+        overlap = longest_overlap(keys[-len(cue):], cue_keys)
+        if overlap < min_overlap:
+            overlap = 0
+
+        words.extend(cue[overlap:])
+        keys.extend(cue_keys[overlap:])
+
+    return ' '.join(words)
@@ -3,7 +3,7 @@ import os
 import ast
 import json
 import googleapiclient.discovery
-from urllib.parse import urlparse, parse_qs
+from urllib.parse import urlparse, parse_qs, unquote
 import isodate
 import requests
 import re
@@ -16,7 +16,17 @@ from pathlib import Path
 import stat
 import shutil
 import tempfile
+import threading
+import time
+import queue
+import atexit
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from cookie_manager import CookieValidator
+from local_cache import SQLiteCache
+import debug_artifacts
+from transcript_normalizer import dedupe_rolling_cues, NORMALIZER_VERSION
+from token_budget import budget_transcripts
 from googleapiclient.discovery import build
 from flask import current_app as app
 
@@ -25,9 +35,14 @@ API_KEY = Config.YOUTUBE_API_KEY # os.environ.get('YOUTUBE_API_KEY')
 OPENAI_API_KEY = Config.OPENAI_API_KEY # os.environ.get('OPENAI_API_KEY')
 MAX_VIDEOS = Config.MAX_VIDEOS_TO_FETCH # app_config['max_videos_to_fetch']
 MAX_VIDEOS_FOR_SUBTITLES = Config.MAX_VIDEOS_FOR_SUBTITLES # app_config['max_videos_for_subtitles']
+SUBTITLE_FETCH_WORKERS = Config.SUBTITLE_FETCH_WORKERS
+SUBTITLE_FETCH_TIMEOUT = Config.SUBTITLE_FETCH_TIMEOUT
 OPENAI_MODEL = Config.OPENAI_MODEL # app_config['openai_model']
 MAX_TOKENS = Config.MAX_TOKENS # app_config['max_tokens']
 COOKIE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "auth/ytc.txt")
+CHANNEL_VIDEO_SOURCE = Config.CHANNEL_VIDEO_SOURCE
+VIDEOS_LIST_MAX_IDS = 50 # videos().list accepts at most 50 IDs per request
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 logging.basicConfig(level=logging.INFO)
@@ -36,6 +51,76 @@ logger = logging.getLogger(__name__)
 # Initialize YouTube API client
 youtube = googleapiclient.discovery.build("youtube", "v3", developerKey=API_KEY)
 
+# Cleaned transcripts keyed by video ID, so repeat fetches skip yt-dlp entirely
+transcript_cache = SQLiteCache(
+    'transcripts',
+    ttl=Config.TRANSCRIPT_CACHE_TTL,
+    max_entries=Config.TRANSCRIPT_CACHE_MAX_ENTRIES
+)
+
+# Handle / custom URL -> channel ID, checked before any API call in resolve_channel_id
+channel_id_cache = SQLiteCache(
+    'channel_ids',
+    ttl=Config.CHANNEL_ID_CACHE_TTL,
+    max_entries=Config.CHANNEL_ID_CACHE_MAX_ENTRIES
+)
+
+# ---
+# QUOTA ACCOUNTING
+# ---
+
+# YouTube Data API v3 quota cost of each method we call, in units
+QUOTA_COSTS = {
+    'search.list': 100,
+    'channels.list': 1,
+    'videos.list': 1,
+    'playlistItems.list': 1,
+    'commentThreads.list': 1
+}
+
+class QuotaTracker:
+    """Counts YouTube Data API quota units spent, broken down by method."""
+
+    def __init__(self):
+        self.units = 0
+        self.calls = {}
+        self._lock = threading.Lock()
+
+    def record(self, method, calls=1):
+        with self._lock:
+            self.units += QUOTA_COSTS.get(method, 1) * calls
+            self.calls[method] = self.calls.get(method, 0) + calls
+
+    def summary(self):
+        with self._lock:
+            return {'units': self.units, 'calls': dict(self.calls)}
+
+# Process-wide total, plus an optional per-call tracker for the current thread
+quota_usage = QuotaTracker()
+_quota_scope = threading.local()
+
+@contextmanager
+def track_quota():
+    """Count the quota spent by API calls made on this thread inside the block."""
+    tracker = QuotaTracker()
+    previous = getattr(_quota_scope, 'tracker', None)
+    _quota_scope.tracker = tracker
+    try:
+        yield tracker
+    finally:
+        _quota_scope.tracker = previous
+
+def record_quota(method, calls=1):
+    quota_usage.record(method, calls)
+    tracker = getattr(_quota_scope, 'tracker', None)
+    if tracker is not None:
+        tracker.record(method, calls)
+
+def execute_api_request(request, method):
+    """Execute a YouTube Data API request, recording its quota cost."""
+    record_quota(method)
+    return request.execute()
+
 def extract_channel_id(url):
     """
     Extract channel ID from a YouTube channel URL only.
@@ -49,40 +134,73 @@ def extract_channel_id(url):
         # Only handle direct channel URL patterns
         if path.startswith('/@'):
             # Handle @username format
-            username = path[2:]  # Remove the leading '/@'
-            try:
-                channel_response = youtube.search().list(
-                    part="snippet",
-                    q=username,
-                    type="channel",
-                    maxResults=1
-                ).execute()
-                if 'items' in channel_response and channel_response['items']:
-                    return channel_response['items'][0]['snippet']['channelId']
-            except Exception as e:
-                logging.error(f"Error fetching channel ID for @{username}: {e}")
-                return None
+            handle = unquote(path[2:].split('/')[0])
+            return resolve_channel_id('handle', handle)
         elif path.startswith('/channel/'):
             # Direct channel ID format
             return path.split('/')[2]
         elif path.startswith('/c/') or path.startswith('/user/'):
             # Custom URL format
-            custom_name = path.split('/')[2]
-            try:
-                channel_response = youtube.search().list(
-                    part="snippet",
-                    q=custom_name,
-                    type="channel",
-                    maxResults=1
-                ).execute()
-                if 'items' in channel_response and channel_response['items']:
-                    return channel_response['items'][0]['snippet']['channelId']
-            except Exception as e:
-                logging.error(f"Error fetching channel ID for {custom_name}: {e}")
-                return None
+            kind = 'custom' if path.startswith('/c/') else 'user'
+            custom_name = unquote(path.split('/')[2])
+            return resolve_channel_id(kind, custom_name)
     
     return None
 
+def resolve_channel_id(kind, name):
+    """
+    Resolve a channel handle ('handle'), custom URL name ('custom') or legacy
+    username ('user') to a channel ID.
+    Checks the persistent channel ID cache before making any API call, so
+    repeat lookups cost no quota.
+    """
+    if not name:
+        return None
+
+    key = f"{kind}:{name.lower()}"
+    channel_id = channel_id_cache.get(key)
+    if channel_id is None:
+        channel_id = lookup_channel_id(kind, name)
+        if channel_id:
+            channel_id_cache.set(key, channel_id)
+
+    return channel_id
+
+def lookup_channel_id(kind, name):
+    """
+    Look up a channel ID with the cheapest API calls first: channels().list by
+    handle and/or username (1 unit each), then search().list (100 units) as a last resort.
+    """
+    if kind == 'handle':
+        lookups = [{'forHandle': name}]
+    elif kind == 'user':
+        lookups = [{'forUsername': name}]
+    else:
+        # /c/ custom URLs usually match the channel's handle or legacy username
+        lookups = [{'forHandle': name}, {'forUsername': name}]
+
+    for lookup in lookups:
+        try:
+            channel_response = execute_api_request(youtube.channels().list(part="id", **lookup), 'channels.list')
+            if channel_response.get('items'):
+                return channel_response['items'][0]['id']
+        except Exception as e:
+            logging.warning(f"Channel lookup {lookup} failed: {e}")
+
+    try:
+        channel_response = execute_api_request(youtube.search().list(
+            part="snippet",
+            q=name,
+            type="channel",
+            maxResults=1
+        ), 'search.list')
+        if 'items' in channel_response and channel_response['items']:
+            return channel_response['items'][0]['snippet']['channelId']
+    except Exception as e:
+        logging.error(f"Error fetching channel ID for {name}: {e}")
+
+    return None
+
 def get_watch_history(credentials, max_results=200):
     """Fetch user's watch history using OAuth credentials."""
     try:
@@ -149,13 +267,13 @@ def get_video_comments(video_id, max_results=100):
 
     while len(comments) < max_results:
         try:
-            response = youtube.commentThreads().list(
+            response = execute_api_request(youtube.commentThreads().list(
                 part="snippet",
                 videoId=video_id,
                 maxResults=min(100, max_results - len(comments)),
                 order="relevance",
                 pageToken=next_page_token
-            ).execute()
+            ), 'commentThreads.list')
 
             for item in response['items']:
                 comment = item['snippet']['topLevelComment']['snippet']
@@ -189,56 +307,122 @@ def extract_video_id(url):
             return parsed_url.path.split('/')[2]
     return None  # Invalid YouTube URL
 
-def get_channel_videos(channel_id, max_results):
-    videos = []
-    next_page_token = None
+def fetch_video_items(video_ids, part="snippet,contentDetails,statistics"):
+    """
+    Fetch videos().list resources for any number of video IDs.
+    IDs are sent VIDEOS_LIST_MAX_IDS per request, and when more than one request
+    is needed they go out together in a single HTTP batch.
+    Returns items in the order of video_ids; unavailable videos are skipped.
+    Raises the first request's error if any part of the batch fails, as a single
+    videos().list call would, rather than returning a partial list.
+    """
+    unique_ids = list(dict.fromkeys(video_ids))
+    chunks = [unique_ids[i:i + VIDEOS_LIST_MAX_IDS] for i in range(0, len(unique_ids), VIDEOS_LIST_MAX_IDS)]
+    items_by_id = {}
+    errors = []
+
+    def collect_items(request_id, response, exception):
+        if exception is not None:
+            logging.error(f"videos().list batch request {request_id} failed: {exception}")
+            errors.append(exception)
+            return
+        for item in response.get('items', []):
+            items_by_id[item['id']] = item
+
+    if len(chunks) == 1:
+        collect_items(None, execute_api_request(youtube.videos().list(part=part, id=','.join(chunks[0])), 'videos.list'), None)
+    elif chunks:
+        batch = youtube.new_batch_http_request(callback=collect_items)
+        for chunk in chunks:
+            batch.add(youtube.videos().list(part=part, id=','.join(chunk)))
+        record_quota('videos.list', len(chunks))
+        batch.execute()
+        if errors:
+            raise errors[0]
+
+    return [items_by_id[video_id] for video_id in unique_ids if video_id in items_by_id]
+
+def parse_video_item(video):
+    """Convert a videos().list item into the video dict used in channel and video data."""
+    duration = video['contentDetails'].get('duration', 'PT0S')
+    try:
+        duration_seconds = isodate.parse_duration(duration).total_seconds()
+    except isodate.ISO8601Error:
+        duration_seconds = 0
 
-    while len(videos) < max_results:
-        request = youtube.search().list(
+    return {
+        'title': video['snippet']['title'],
+        'description': video['snippet']['description'],
+        'length': int(duration_seconds),
+        'date_published': video['snippet']['publishedAt'],
+        'tags': video['snippet'].get('tags', []),
+        'youtube_video_id': video['id'],
+        'youtube_category_id': video['snippet'].get('categoryId', 'Unknown'),
+        'views': int(video['statistics'].get('viewCount', 0)),
+        'like_count': int(video['statistics'].get('likeCount', 0)),
+        'comment_count': int(video['statistics'].get('commentCount', 0)),
+        'thumbnail_url': video['snippet']['thumbnails']['default']['url'],
+        'channel_title': video['snippet']['channelTitle']
+    }
+
+def is_short_video(video, duration_seconds):
+    """Shorts are vertical videos of a minute or less."""
+    width = video['snippet']['thumbnails']['default']['width']
+    height = video['snippet']['thumbnails']['default']['height']
+    return duration_seconds <= 60 and height > width
+
+def get_channel_video_ids_page(channel_id, page_size, page_token=None, uploads_playlist_id=None):
+    """
+    Return one page of a channel's most recent video IDs as (video_ids, next_page_token).
+    Pages the channel's uploads playlist (1 quota unit per page) when its ID is known
+    and CHANNEL_VIDEO_SOURCE is 'uploads', otherwise falls back to search (100 units per page).
+    """
+    if uploads_playlist_id and CHANNEL_VIDEO_SOURCE == 'uploads':
+        response = execute_api_request(youtube.playlistItems().list(
+            part="contentDetails",
+            playlistId=uploads_playlist_id,
+            maxResults=page_size,
+            pageToken=page_token
+        ), 'playlistItems.list')
+        video_ids = [item['contentDetails']['videoId'] for item in response.get('items', [])]
+    else:
+        response = execute_api_request(youtube.search().list(
             part="id,snippet",
             channelId=channel_id,
-            maxResults=min(50, max_results - len(videos)),
+            maxResults=page_size,
             order="date",
             type="video",
-            pageToken=next_page_token
-        )
-        response = request.execute()
+            pageToken=page_token
+        ), 'search.list')
+        video_ids = [item['id']['videoId'] for item in response.get('items', [])]
 
-        video_ids = [item['id']['videoId'] for item in response['items']]
-        videos_response = youtube.videos().list(
-            part="snippet,contentDetails,statistics",
-            id=','.join(video_ids)
-        ).execute()
+    return video_ids, response.get('nextPageToken')
 
-        for video in videos_response['items']:
-            duration = video['contentDetails'].get('duration', 'PT0S')
-            try:
-                duration_seconds = isodate.parse_duration(duration).total_seconds()
-            except isodate.ISO8601Error:
-                duration_seconds = 0
-            
-            width = video['snippet']['thumbnails']['default']['width']
-            height = video['snippet']['thumbnails']['default']['height']
-            is_vertical = height > width
-            is_short = duration_seconds <= 60 and is_vertical
-
-            if not is_short:
-                videos.append({
-                    'title': video['snippet']['title'],
-                    'description': video['snippet']['description'],
-                    'length': int(duration_seconds),
-                    'date_published': video['snippet']['publishedAt'],
-                    'tags': video['snippet'].get('tags', []),
-                    'youtube_video_id': video['id'],
-                    'youtube_category_id': video['snippet'].get('categoryId', 'Unknown'),
-                    'views': int(video['statistics'].get('viewCount', 0)),
-                    'like_count': int(video['statistics'].get('likeCount', 0)),
-                    'comment_count': int(video['statistics'].get('commentCount', 0)),
-                    'thumbnail_url': video['snippet']['thumbnails']['default']['url'],
-                    'channel_title': video['snippet']['channelTitle']
-                })
+def get_channel_videos(channel_id, max_results, uploads_playlist_id=None):
+    videos = []
+    next_page_token = None
+
+    while len(videos) < max_results:
+        # Collect enough IDs to fill the remaining slots, then look up their
+        # metadata in as few videos().list calls as possible
+        video_ids = []
+        while len(video_ids) < max_results - len(videos):
+            page_ids, next_page_token = get_channel_video_ids_page(
+                channel_id,
+                min(50, max_results - len(videos) - len(video_ids)),
+                next_page_token,
+                uploads_playlist_id
+            )
+            video_ids.extend(page_ids)
+
+            if not next_page_token:
+                break
+
+        for video in fetch_video_items(video_ids):
+            video_data = parse_video_item(video)
+            if not is_short_video(video, video_data['length']):
+                videos.append(video_data)
 
-        next_page_token = response.get('nextPageToken')
         if not next_page_token:
             break
 
@@ -248,18 +432,7 @@ def get_video_data(video_id, include_comments=False):
     output = []
 
     try:
-        video_response = youtube.videos().list(
-            part="snippet,contentDetails,statistics",
-            id=video_id
-        ).execute()
-
-        for video in video_response['items']:
-            duration = video['contentDetails'].get('duration', 'PT0S')
-            try:
-                duration_seconds = isodate.parse_duration(duration).total_seconds()
-            except isodate.ISO8601Error:
-                duration_seconds = 0
-
+        for video in fetch_video_items([video_id]):
             subtitles = get_video_subtitles(video_id)
 
             if subtitles:
@@ -268,21 +441,8 @@ def get_video_data(video_id, include_comments=False):
                 logging.warning(f"No subtitles available for video: {video['snippet']['title']}")
                 return None  # Return None if subtitles are not available
 
-            video_data = {
-                'title': video['snippet']['title'],
-                'description': video['snippet']['description'],
-                'length': int(duration_seconds),
-                'date_published': video['snippet']['publishedAt'],
-                'tags': video['snippet'].get('tags', []),
-                'youtube_video_id': video['id'],
-                'youtube_category_id': video['snippet'].get('categoryId', 'Unknown'),
-                'views': int(video['statistics'].get('viewCount', 0)),
-                'like_count': int(video['statistics'].get('likeCount', 0)),
-                'comment_count': int(video['statistics'].get('commentCount', 0)),
-                'thumbnail_url': video['snippet']['thumbnails']['default']['url'],
-                'channel_title': video['snippet']['channelTitle'],
-                'subtitles': subtitles
-            }
+            video_data = parse_video_item(video)
+            video_data['subtitles'] = subtitles
 
             if include_comments:
                 video_data['top_comments'] = get_video_comments(video_id)
@@ -352,91 +512,216 @@ def cleanup_temp_cookie_file(temp_file):
 
 def get_video_subtitles(video_id):
     """
-    Fetch the subtitle file for a given video ID using yt-dlp.
+    Return the cleaned transcript for a video, served from the transcript cache when
+    possible and downloaded with yt-dlp otherwise.
+    Returns None if subtitles are not available.
+    """
+    cache_key = transcript_cache_key(video_id)
+    subtitles_text = transcript_cache.get(cache_key)
+    if subtitles_text is not None:
+        logging.info(f"Transcript cache hit for video: {video_id}")
+        return subtitles_text
+
+    subtitles_text = download_video_subtitles(video_id)
+    if subtitles_text:
+        transcript_cache.set(cache_key, subtitles_text)
+
+    return subtitles_text
+
+def transcript_cache_key(video_id):
+    """Cache key for a video's cleaned transcript, versioned with the normalizer."""
+    return f"v{NORMALIZER_VERSION}:{video_id}"
+
+def download_video_subtitles(video_id):
+    """
+    Fetch the subtitle file for a given video ID using the shared subtitle client.
     Returns only the spoken text content without formatting, timestamps, or metadata.
     Returns None if subtitles are not available.
     """
-    video_url = f'https://www.youtube.com/watch?v={video_id}'
-    temp_cookie_file = None
-    subtitles_text = None
+    subtitles_text = get_subtitle_client().fetch(video_id)
 
-    try:
-        temp_cookie_file = create_temp_cookie_file()
-        
-        if not temp_cookie_file:
-            logging.error("Failed to create temporary cookie file")
-            return None
-        
-        # Create yt-dlp options with format specification
-        ydl_opts = {
+    debug_artifacts.record(f"subtitles_{video_id}", subtitles_text)
+
+    return subtitles_text
+
+class SubtitleClient:
+    """
+    Long-lived subtitle fetcher shared by fetch_channel_data and get_video_data.
+    Owns one cookie file per process, a keep-alive requests.Session for the srv1
+    downloads and a small pool of reusable YoutubeDL instances (a YoutubeDL isn't
+    safe to use from two threads at once, so concurrent fetches each borrow one).
+    """
+
+    def __init__(self, pool_size=SUBTITLE_FETCH_WORKERS):
+        self.cookie_file = None
+        self._idle_ydls = queue.LifoQueue()
+        self._lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'User-Agent': USER_AGENT, 'Referer': 'https://www.youtube.com/'})
+
+    def _get_cookie_file(self):
+        with self._lock:
+            if not self.cookie_file:
+                self.cookie_file = create_temp_cookie_file()
+            return self.cookie_file
+
+    def _ydl_opts(self, cookie_file):
+        return {
             'nocheckcertificate': True,
             'no_warnings': True,
             'ignoreerrors': False,
             'quiet': True,
             'no_color': True,
-            'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'user_agent': USER_AGENT,
             'referer': 'https://www.youtube.com/',
-            'cookiefile': temp_cookie_file,
+            'cookiefile': cookie_file,
             'no_cache_dir': True,
             'no_overwrites': True,
             'no_cookies': True,
             'format': 'best',
-            'extract_flat': True 
+            'extract_flat': True,
+            'socket_timeout': SUBTITLE_FETCH_TIMEOUT,
+            'skip_download': True,
+            'writesubtitles': True,
+            'writeautomaticsub': True,
+            'subtitleslangs': ['en', 'en-US']
         }
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            ydl_opts.update({
-                'skip_download': True,
-                'writesubtitles': True,
-                'writeautomaticsub': True,
-                'subtitleslangs': ['en', 'en-US'],
-                'outtmpl': os.path.join(temp_dir, '%(id)s.%(ext)s')
-            })
-            
+    def _acquire_ydl(self):
+        try:
+            return self._idle_ydls.get_nowait()
+        except queue.Empty:
+            cookie_file = self._get_cookie_file()
+            if not cookie_file:
+                raise RuntimeError("Failed to create temporary cookie file")
+            logging.info("Creating new YoutubeDL instance for subtitle client")
+            return yt_dlp.YoutubeDL(self._ydl_opts(cookie_file))
+
+    def fetch(self, video_id):
+        """Return the cleaned English auto-caption transcript for a video, or None."""
+        video_url = f'https://www.youtube.com/watch?v={video_id}'
+
+        try:
+            ydl = self._acquire_ydl()
+        except Exception as e:
+            logging.error(f"Error in subtitle extraction: {str(e)}")
+            return None
+
+        try:
             logging.info(f"Attempting to fetch subtitles for video: {video_id}")
-            logging.debug(f"yt-dlp options: {ydl_opts}")
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(video_url, download=False)
+            logging.debug(f"Video info extracted: {info.keys()}")
 
-                logging.info("Extracting video info...")
-                info = ydl.extract_info(video_url, download=False)
-                logging.debug(f"Video info extracted: {info.keys()}")
-                                
-                # Check for and download subtitles
-                if 'automatic_captions' in info and ('en' in info['automatic_captions'] or 'en-US' in info['automatic_captions']):
-                    logging.info("Automatic English captions found. Downloading...")
-                    
-                    try:
-                        srv1_url = next(item["url"] for item in info["automatic_captions"]["en"] if item["ext"] == "srv1")
-                    except StopIteration:
-                        logging.error("No SRV1 format found")
-                    
-                    response = requests.get(srv1_url)
+            captions = info.get('automatic_captions') or {}
+            caption_formats = captions.get('en') or captions.get('en-US')
+            if not caption_formats:
+                logging.warning(f"No English captions available for video: {video_id}")
+                return None
 
-                    if response.status_code == 200:
-                        subtitles_text = extract_transcript_text(response.text)
+            srv1_url = next((item['url'] for item in caption_formats if item['ext'] == 'srv1'), None)
+            if not srv1_url:
+                logging.error("No SRV1 format found")
+                return None
 
-                else:
-                    logging.warning(f"No English captions available for video: {video_id}")
-                    return None
+            response = self.session.get(srv1_url, timeout=SUBTITLE_FETCH_TIMEOUT)
+            if response.status_code == 200:
+                return extract_transcript_text(response.text)
 
-    except Exception as e:
-        logging.error(f"Error in subtitle extraction: {str(e)}")
-        # Don't return None here - we might have subtitles despite the error
-        
-    finally:
-        # Try to clean up the temporary cookie file, but don't let cleanup failures affect the result
-        if temp_cookie_file:
+            logging.warning(f"Caption download for video {video_id} returned status {response.status_code}")
+            return None
+
+        except Exception as e:
+            logging.error(f"Error in subtitle extraction: {str(e)}")
+            return None
+
+        finally:
+            self._idle_ydls.put(ydl)
+
+    def close(self):
+        """Release the HTTP session, YoutubeDL instances and cookie file."""
+        self.session.close()
+        while True:
             try:
-                cleanup_temp_cookie_file(temp_cookie_file)
+                self._idle_ydls.get_nowait().close()
+            except queue.Empty:
+                break
             except Exception as e:
-                logging.warning(f"Non-critical error during cleanup: {str(e)}")
-                # Continue anyway - cleanup failure shouldn't invalidate successful subtitle extraction
+                logging.warning(f"Error closing YoutubeDL instance: {str(e)}")
+        cleanup_temp_cookie_file(self.cookie_file)
+        self.cookie_file = None
+
+_subtitle_client = None
+_subtitle_client_lock = threading.Lock()
+
+def get_subtitle_client():
+    """Return the process-wide SubtitleClient, creating it on first use."""
+    global _subtitle_client
+    with _subtitle_client_lock:
+        if _subtitle_client is None:
+            _subtitle_client = SubtitleClient()
+            atexit.register(_subtitle_client.close)
+        return _subtitle_client
+
+def fetch_subtitles_concurrently(video_ids, max_workers=SUBTITLE_FETCH_WORKERS, timeout=SUBTITLE_FETCH_TIMEOUT):
+    """
+    Fetch subtitles for several videos at once using a bounded thread pool.
+    Returns a list of subtitle strings (or None) in the same order as video_ids.
+    Each video's timeout runs from when a worker starts on it; a video that
+    fails or overruns gets None without holding up the ones that finish.
+    """
+    if not video_ids:
+        return []
 
-    with open('subtitles.txt', 'w') as file:
-        file.write(subtitles_text)
+    workers = max(1, min(max_workers, len(video_ids)))
+    results = [None] * len(video_ids)
+    started = {}
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='subtitles')
 
-    return subtitles_text  # Return whatever we got, even if cleanup failed
+    # Workers record subtitle artifacts under the calling job's scope
+    scoped_fetch = debug_artifacts.in_scope(debug_artifacts.capture_scope(), get_video_subtitles)
+
+    def fetch(index):
+        started[index] = time.monotonic()
+        return scoped_fetch(video_ids[index])
+
+    try:
+        futures = {executor.submit(fetch, index): index for index in range(len(video_ids))}
+        pending = set(futures)
+        overrun = []
+
+        while pending:
+            running_deadlines = [started[futures[future]] + timeout for future in pending if futures[future] in started]
+            wait_for = max(0, min(running_deadlines) - time.monotonic()) if running_deadlines else timeout
+            done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    logging.error(f"Error fetching subtitles for video {video_ids[index]}: {str(e)}")
+
+            now = time.monotonic()
+            for future in list(pending):
+                index = futures[future]
+                if index in started and now - started[index] >= timeout:
+                    logging.warning(f"Timed out fetching subtitles for video: {video_ids[index]}")
+                    pending.discard(future)
+                    overrun.append(future)
+
+            # Overrun fetches keep their threads; once they hold every worker, nothing queued can start
+            if pending and sum(future.running() for future in overrun) >= workers:
+                for future in pending:
+                    logging.warning(f"No free worker to fetch subtitles for video: {video_ids[futures[future]]}")
+                break
+    finally:
+        # Don't block the report on stragglers; their results are discarded
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return results
 
 def clean_subtitle_text(subtitle_content):
     """
@@ -524,8 +809,8 @@ def extract_transcript_text(transcript_content: str) -> str:
         if not text_segments:
             raise ValueError("No valid text segments found in transcript")
 
-        # Join segments with a space and clean up any extra whitespace
-        clean_text = ' '.join(text_segments)
+        # Join segments, dropping the overlap between rolling auto-caption cues
+        clean_text = dedupe_rolling_cues(text_segments)
         
         # Clean up whitespace issues
         clean_text = re.sub(r'\s+', ' ', clean_text)  # Multiple spaces to single
@@ -557,11 +842,17 @@ def save_json_to_file(data, channel_id):
     return filename
 
 def fetch_channel_data(channel_id):
+    with track_quota() as quota:
+        channel_data = fetch_channel_data_untracked(channel_id)
+    logging.info(f"YouTube API quota used for channel {channel_id}: {quota.summary()}")
+    return channel_data
+
+def fetch_channel_data_untracked(channel_id):
     try:
-        channel_response = youtube.channels().list(
-            part="snippet,statistics,brandingSettings",
+        channel_response = execute_api_request(youtube.channels().list(
+            part="snippet,statistics,brandingSettings,contentDetails",
             id=channel_id
-        ).execute()
+        ), 'channels.list')
 
         if 'items' in channel_response:
             channel_info = channel_response['items'][0]
@@ -580,28 +871,31 @@ def fetch_channel_data(channel_id):
             }
             
             # Get info for the most recent videos
-            channel_data['videos'] = get_channel_videos(channel_id, MAX_VIDEOS)
+            uploads_playlist_id = channel_info.get('contentDetails', {}).get('relatedPlaylists', {}).get('uploads')
+            channel_data['videos'] = get_channel_videos(channel_id, MAX_VIDEOS, uploads_playlist_id)
             
             # Sort videos by date (most recent first) and get subtitles for only the most recent ones
             channel_data['videos'].sort(key=lambda x: x['date_published'], reverse=True)
             
-            for video in channel_data['videos'][:MAX_VIDEOS_FOR_SUBTITLES]:
-                subtitles = get_video_subtitles(video['youtube_video_id'])
+            subtitle_videos = channel_data['videos'][:MAX_VIDEOS_FOR_SUBTITLES]
+            subtitle_results = fetch_subtitles_concurrently([video['youtube_video_id'] for video in subtitle_videos])
+
+            for video, subtitles in zip(subtitle_videos, subtitle_results):
                 if subtitles:
-                    if len(subtitles) > 8000:
-                        subtitles = subtitles[:8000]
-                    
                     video['subtitles'] = subtitles
-                    print(f"Retrieved subtitles for video: {video['title']}")
+                    logging.info(f"Retrieved subtitles for video: {video['title']}")
                 else:
-                    print(f"No subtitles available for video: {video['title']}")
+                    logging.warning(f"No subtitles available for video: {video['title']}")
+
+            # Share the prompt's transcript budget across the videos, sampling each whole transcript
+            budget_transcripts(subtitle_videos)
 
             return channel_data
         else:
             return None
 
     except Exception as e:
-        print(f"An error occurred while fetching channel data: {e}")
+        logging.error(f"An error occurred while fetching channel data: {e}")
         return None
     
 ''' *** MISGUIDED IDEAS *** '''